@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+__description__ = \
+"""
+Benchmarks for the colorwheels, rxb conversion, the clock update path, the
+neopixel driver and the control socket.  Runs on any machine: hardware is
+replaced by in-memory fakes.
+Results are written as JSON so runs from different versions can be compared.
+
+    python3 benchmarks/run_benchmarks.py --output results.json
+    python3 benchmarks/run_benchmarks.py --output new.json --compare old.json
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import sys, os, json, time, timeit, platform, argparse, datetime, tempfile
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),".."))
+
+import numpy as np
+
+import colorchron
+from colorchron.colorwheel import rxb
+
+class FakeStrip:
+    """
+    Stand-in for neopixel.NeoPixel that stores pixels in a list.
+    """
+
+    def __init__(self,num_leds):
+        self._pixels = [(0,0,0)]*num_leds
+        self.num_shows = 0
+
+    def __setitem__(self,index,value):
+        self._pixels[index] = value
+
+    def fill(self,color):
+        self._pixels = [color]*len(self._pixels)
+
+    def show(self):
+        self.num_shows += 1
+
+def _time(stmt,number,repeat):
+    """
+    Best time per call of stmt (in seconds) over repeat runs of number calls.
+    """
+
+    times = timeit.repeat(stmt,number=number,repeat=repeat)
+
+    return min(times)/number
+
+def _result(per_call,items=1):
+    """
+    Package a timing as a dictionary.  items is the number of colors (or
+    pixels) handled per call.
+    """
+
+    return {"seconds_per_call":per_call,
+            "calls_per_second":1/per_call,
+            "items_per_call":items,
+            "items_per_second":items/per_call}
+
+def bench_colorwheels(number,repeat):
+
+    results = {}
+    batch = np.arange(86400)
+    for name in ["RGB","CMY","HSV","RYB","Chromachron"]:
+        wheel = getattr(colorchron.colorwheel,name)()
+
+        t = [0]
+        def call():
+            t[0] = (t[0] + 1) % 86400
+            wheel.rgb(t[0])
+        results["colorwheel.{}.rgb".format(name)] = _result(_time(call,number,repeat))
+
+        per_call = _time(lambda: wheel.rgb_many(batch),max(1,number//10000),repeat)
+        results["colorwheel.{}.rgb_many".format(name)] = _result(per_call,len(batch))
+
+    return results
+
+def bench_rxb(number,repeat):
+
+    results = {}
+    magic = colorchron.colorwheel.RYB._magic
+    values = [0.3,0.6,0.9]
+    many = np.random.RandomState(0).random_sample((10000,3))
+
+    per_call = _time(lambda: rxb.rxb_to_rgb(values,magic),number,repeat)
+    results["rxb.rxb_to_rgb"] = _result(per_call)
+
+    transform = rxb.RXBTransform(magic)
+
+    per_call = _time(lambda: transform.to_rgb(values),number,repeat)
+    results["rxb.RXBTransform.to_rgb"] = _result(per_call)
+
+    per_call = _time(lambda: transform.to_rgb_many(many),max(1,number//1000),repeat)
+    results["rxb.RXBTransform.to_rgb_many"] = _result(per_call,len(many))
+
+    return results
+
+def bench_clock_update(number,repeat):
+
+    results = {}
+    for name in ["RGB","RYB"]:
+        clock = colorchron.Clock()
+        clock.add_colorwheel(getattr(colorchron.colorwheel,name)())
+        clock.add_led("fake")
+        clock.add_ambient_light_sensor("fake")
+
+        per_call = _time(clock._update,number,repeat)
+        results["clock._update.{}".format(name)] = _result(per_call)
+
+    return results
+
+def bench_neopixel(number,repeat):
+
+    results = {}
+    rng = np.random.RandomState(0)
+    for num_leds in [15,60,300]:
+        led = colorchron.led.create("neopixel",num_leds,pixels=FakeStrip(num_leds))
+
+        # Alternate between two colors so every call writes
+        colors = [(10,20,30),(30,20,10)]
+        i = [0]
+        def set_uniform():
+            i[0] ^= 1
+            led.set(colors[i[0]])
+        per_call = _time(set_uniform,max(1,number//10),repeat)
+        results["neopixel.set.uniform.{}".format(num_leds)] = _result(per_call,num_leds)
+
+        frames = [rng.randint(0,256,(num_leds,3)) for _ in range(2)]
+        def set_frame():
+            i[0] ^= 1
+            led.set(frames[i[0]])
+        per_call = _time(set_frame,max(1,number//100),repeat)
+        results["neopixel.set.frame.{}".format(num_leds)] = _result(per_call,num_leds)
+
+        per_call = _time(lambda: led.set(frames[0]),max(1,number//10),repeat)
+        results["neopixel.set.unchanged.{}".format(num_leds)] = _result(per_call,num_leds)
+
+    return results
+
+def bench_control_socket(number,repeat):
+    """
+    Round trip from a set_brightness request on the control socket to the new
+    values reaching the leds, for an event-driven clock whose output would
+    otherwise not change for max_sleep seconds.  Fails if the change waits
+    for the clock to wake on its own.
+    """
+
+    from colorchron import control
+
+    results = {}
+
+    path = os.path.join(tempfile.mkdtemp(),"colorchron.sock")
+    clock = colorchron.Clock(event_driven=True,max_sleep=60)
+    clock.add_colorwheel(colorchron.colorwheel.RGB(seconds_per_cycle=86400))
+    clock.add_led("fake")
+    clock.add_control_socket(path)
+    clock.start(runner="thread")
+
+    try:
+        # The running clock creates the socket and then makes its first update
+        timeout = 5.0
+        start = time.monotonic()
+        while not os.path.exists(path) or clock.values is None:
+            if time.monotonic() - start > timeout:
+                err = "clock did not start.\n"
+                raise RuntimeError(err)
+            time.sleep(0.001)
+
+        with control.Client(path,timeout=timeout) as client:
+
+            times = []
+            for i in range(repeat):
+                brightness = [0.3,0.6][i % 2]
+                before = client.request("get_rgb")["values"]
+
+                start = time.perf_counter()
+                client.request("set_brightness",value=brightness)
+                while client.request("get_rgb")["values"] == before:
+                    if time.perf_counter() - start > timeout:
+                        err = "event-driven clock did not apply set_brightness within {} seconds.\n".format(timeout)
+                        raise RuntimeError(err)
+                    time.sleep(0.001)
+                times.append(time.perf_counter() - start)
+
+    finally:
+        clock.stop()
+
+    results["control.set_brightness.event_driven"] = _result(min(times))
+
+    return results
+
+def _version():
+
+    try:
+        from importlib import metadata
+        return metadata.version("colorchron")
+    except Exception:
+        return "unknown"
+
+def compare(new,old):
+    """
+    Print the ratio of time per call (new/old) for each benchmark found in
+    both result sets.
+    """
+
+    print("{:45s} {:>12s} {:>12s} {:>8s}".format("benchmark","old (us)","new (us)","new/old"))
+    for key in sorted(new["results"]):
+        if key not in old["results"]:
+            continue
+        a = old["results"][key]["seconds_per_call"]
+        b = new["results"][key]["seconds_per_call"]
+        print("{:45s} {:12.3f} {:12.3f} {:8.2f}".format(key,a*1e6,b*1e6,b/a))
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Benchmark colorchron.")
+    parser.add_argument("--output",default="bench_results.json",
+                        help="file to write results to (JSON)")
+    parser.add_argument("--compare",default=None,
+                        help="earlier results file to compare against")
+    parser.add_argument("--number",type=int,default=20000,
+                        help="calls per timing run for per-call benchmarks")
+    parser.add_argument("--repeat",type=int,default=5,
+                        help="timing runs per benchmark (best is kept)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for bench in [bench_colorwheels,bench_rxb,bench_clock_update,bench_neopixel,
+                  bench_control_socket]:
+        results.update(bench(args.number,args.repeat))
+
+    out = {"colorchron":_version(),
+           "python":platform.python_version(),
+           "numpy":np.__version__,
+           "platform":platform.platform(),
+           "machine":platform.machine(),
+           "date":datetime.datetime.now().isoformat(),
+           "number":args.number,
+           "repeat":args.repeat,
+           "results":results}
+
+    with open(args.output,"w") as f:
+        json.dump(out,f,indent=2,sort_keys=True)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            old = json.load(f)
+        compare(out,old)
+    else:
+        for key in sorted(results):
+            print("{:45s} {:12.3f} us".format(key,results[key]["seconds_per_call"]*1e6))
+
+if __name__ == "__main__":
+    main()
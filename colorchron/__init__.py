@@ -1,4 +1,10 @@
 from .colorchron import Clock
+from .aio import AsyncClock
 from . import colorwheel
 from . import led
 from . import light_sensor
+from . import spatial
+from . import output
+from . import transition
+from . import recorder
+from . import compositor
@@ -0,0 +1,124 @@
+__description__ = \
+"""
+Clock that runs as a coroutine inside an existing asyncio application rather
+than in its own process or thread.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import asyncio, time
+
+from .colorchron import Clock
+
+class AsyncClock(Clock):
+    """
+    Control leds to display time as a color from an asyncio event loop.  Takes
+    the same arguments as Clock.
+
+        clock = colorchron.AsyncClock()
+        clock.add_colorwheel(colorchron.colorwheel.RGB())
+        clock.add_led("neopixel")
+
+        clock.start()          # from inside a running event loop
+        ...
+        await clock.stop()
+
+    or simply "await clock.run()".
+    """
+
+    __slots__ = ("_task",)
+
+    def __init__(self,*args,**kwargs):
+
+        super().__init__(*args,**kwargs)
+
+        self._task = None
+
+    async def _async_sleep(self,seconds):
+        """
+        Sleep without blocking the event loop, waking early if the clock is
+        asked to stop.  A control socket is checked every poll_interval (see
+        add_control_socket), waking early if a request changes the clock.
+        """
+
+        server = self._control_server
+
+        try:
+            wall = self._time_source.wall_seconds(seconds)
+        except AttributeError:
+            # Time source cannot say how long it sleeps; sleep in a worker
+            # thread so the event loop keeps running
+            if server is not None:
+                server.serve(0)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None,self._time_source.sleep,seconds)
+            return
+
+        # Simulated time that does not wait: just let it pass
+        if wall <= 0:
+            if server is not None:
+                server.serve(0)
+            self._time_source.sleep(seconds)
+            await asyncio.sleep(0)
+            return
+
+        end = time.monotonic() + wall
+        while not self._stop_event.is_set():
+            if server is not None and server.serve(0):
+                return
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            if server is not None:
+                remaining = min(remaining,self._control_poll)
+            try:
+                await asyncio.wait_for(self._stop_event.wait(),remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self,duration=None):
+        """
+        Run the clock.  If duration is given, return after that many seconds
+        according to the clock's time source.  The leds are blanked or held
+        (see on_stop) when the coroutine finishes or is cancelled.
+        """
+
+        if self._running:
+            err = "clock is already running.\n"
+            raise RuntimeError(err)
+
+        self._stop_event = asyncio.Event()
+        self._runner = "asyncio"
+        self._running = True
+        try:
+            for delay in self._schedule(duration):
+                await self._async_sleep(delay)
+        finally:
+            self._shutdown()
+            self._running = False
+            self._runner = None
+
+    def start(self):
+        """
+        Schedule the clock as a task on the running event loop.  Returns the
+        task.
+        """
+
+        if self._task is not None and not self._task.done():
+            return self._task
+
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+        return self._task
+
+    async def stop(self):
+        """
+        Ask the clock to stop and wait for it to finish.
+        """
+
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+        if self._task is not None:
+            await self._task
+            self._task = None
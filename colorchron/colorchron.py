@@ -5,17 +5,123 @@ Control a clock that displays an RGB value to represent time.
 __author__ = "Michael J. Harms"
 __date__ = "2018-04-30"
 
-import time, datetime, json, sys, copy, multiprocessing, math
+import time, json, sys, copy, multiprocessing, threading, math, inspect
+
+import numpy as np
+
+from .shared import ControlBlock
+from .metrics import Metrics
+from .timesource import SystemTime
+from . import fixed as _fixed
+from . import led as _led
+from . import light_sensor as _light_sensor
+
+def calc_bright_scalar(brightness,ambient,min_brightness):
+    """
+    Combine the user brightness and the ambient brightness into the scalar
+    applied to the leds, limited to be between min_brightness and 1.
+    """
+
+    bright_scalar = brightness*ambient
+    if bright_scalar > 1:
+        bright_scalar = 1.0
+    if bright_scalar < min_brightness:
+        bright_scalar = min_brightness
+
+    return bright_scalar
+
+def scale(rgb,bright_scalar):
+    """
+    Scale an N x 3 array of RGB values so each row sums to 255*bright_scalar.
+    Returns floats (levels between 0 and 255).  bright_scalar is either a
+    single value or one value per row.
+    """
+
+    rgb = np.asarray(rgb,dtype=float).reshape(-1,3)
+
+    total = rgb.sum(axis=1)
+    total[total == 0] = 1.0
+
+    if np.ndim(bright_scalar) > 0:
+        bright_scalar = np.asarray(bright_scalar,dtype=float).reshape(-1,1)
+
+    return 255*bright_scalar*rgb/total[:,None]
+
+def normalize(rgb,bright_scalar):
+    """
+    Vectorized version of the normalization done by Clock._update.  Takes an
+    N x 3 array of RGB values and returns an N x 3 integer array whose rows
+    sum to (roughly) 255*bright_scalar.  bright_scalar is either a single
+    value or one value per row.
+    """
+
+    return np.round(scale(rgb,bright_scalar),0).astype(int)
 
 class Clock:
     """
     Control leds to display time as a color.
     """
+
+    __slots__ = ("_update_interval",
+                 "_brightness",
+                 "_min_brightness",
+                 "_subsecond",
+                 "_fixed_point",
+                 "_event_driven",
+                 "_ambient_threshold",
+                 "_sensor_interval",
+                 "_max_sleep",
+                 "_metrics_file",
+                 "_metrics_interval",
+                 "_metrics",
+                 "_next_metrics_write",
+                 "_time_source",
+                 "_colorwheel",
+                 "_wheel_takes_out",
+                 "_led",
+                 "_layout",
+                 "_output_stage",
+                 "_transition",
+                 "_recorder",
+                 "_levels",
+                 "_frame_times",
+                 "_light_sensor",
+                 "_on_stop",
+                 "_running",
+                 "_runner",
+                 "_process",
+                 "_stop_event",
+                 "_rgb",
+                 "_out",
+                 "_time_in_seconds",
+                 "_bright_scalar",
+                 "_ambient",
+                 "_values",
+                 "_missed_deadlines",
+                 "_control",
+                 "_control_generation",
+                 "_wheel_params",
+                 "_paused",
+                 "_control_path",
+                 "_control_mode",
+                 "_control_poll",
+                 "_control_server")
     
     def __init__(self,
                  update_interval=0.1,
                  brightness=1.0,
-                 min_brightness=0.05):
+                 min_brightness=0.05,
+                 subsecond=False,
+                 fixed_point=False,
+                 event_driven=False,
+                 ambient_threshold=0.02,
+                 sensor_interval=1.0,
+                 max_sleep=60.0,
+                 metrics=False,
+                 metrics_file=None,
+                 metrics_interval=60.0,
+                 time_source=None,
+                 on_stop="blank"):
         """
         update_interval: how often to update the clock in seconds.
         brightness: overall brightness of the clock (between 0 and 1).  If an 
@@ -23,6 +129,33 @@ class Clock:
                     be applied on top of brightness changes indicated by the
                     sensor.
         min_brightness: minimum brightness of clock
+        subsecond: pass fractional seconds to the colorwheel rather than
+                   whole seconds (True or False).  Gives smooth output for
+                   wheels with short seconds_per_cycle.  (Note that lookup
+                   table colorwheels only tabulate whole seconds).
+        fixed_point: calculate the colorwheel output and normalization with
+                     integers (True or False).  Results are reproducible bit
+                     for bit.  Only RGB, CMY, HSV and Chromachron wheels are
+                     supported (see colorchron.fixed).
+        event_driven: instead of waking every update_interval, work out when
+                      the LED output will next change and sleep until then
+                      (True or False). 
+        ambient_threshold: (event_driven only) wake early if the ambient
+                           brightness moves by more than this amount.
+        sensor_interval: (event_driven only) how often to check the ambient
+                         light sensor while sleeping, in seconds.
+        max_sleep: (event_driven only) longest time to sleep between updates,
+                   in seconds.
+        metrics: collect update timings and counters (True or False).  Read
+                 them with the metrics method.
+        metrics_file: if set, the running clock writes its metrics to this
+                      file every metrics_interval seconds (implies metrics).
+        metrics_interval: seconds between writes of metrics_file.
+        time_source: where the clock gets the time and how it sleeps.  If
+                     None, use the system clock.  See colorchron.timesource
+                     (VirtualTime runs the clock faster than real time).
+        on_stop: what to do with the leds when the clock stops.  "blank" turns
+                 them off; "hold" leaves them showing the last color.
         """
 
         self._update_interval = update_interval
@@ -40,92 +173,689 @@ class Clock:
             err = "minimum brightness must be between 0 and 1.\n"
             raise ValueError(err)
 
+        self._subsecond = bool(subsecond)
+        self._fixed_point = bool(fixed_point)
+        self._event_driven = bool(event_driven)
+
+        self._ambient_threshold = ambient_threshold
+        if self._ambient_threshold < 0:
+            err = "ambient threshold must not be negative.\n"
+            raise ValueError(err)
+
+        self._sensor_interval = sensor_interval
+        if self._sensor_interval <= 0:
+            err = "sensor interval must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._max_sleep = max_sleep
+        if self._max_sleep <= 0:
+            err = "max sleep must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._metrics_file = metrics_file
+        self._metrics_interval = metrics_interval
+        if self._metrics_interval <= 0:
+            err = "metrics interval must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._metrics = None
+        if metrics or self._metrics_file is not None:
+            self._metrics = Metrics()
+
+        if time_source is None:
+            time_source = SystemTime()
+        self._time_source = time_source
+
+        self._on_stop = on_stop
+        if self._on_stop not in ["blank","hold"]:
+            err = "on_stop must be 'blank' or 'hold'.\n"
+            raise ValueError(err)
+
         # Currently no colorwheel
         self._colorwheel = None
+        self._wheel_takes_out = False
 
         # Currently no led
         self._led = None
 
+        # Currently every led shows the same color
+        self._layout = None
+        self._frame_times = None
+
+        # Currently no output stage (channel levels are simply rounded)
+        self._output_stage = None
+        self._levels = [0.,0.,0.]
+
+        # Currently output jumps straight to new values
+        self._transition = None
+
+        # Currently updates are not recorded
+        self._recorder = None
+
         # Currently no light sensor
         self._light_sensor = None
 
         # Currently stopped
         self._running = False
+        self._runner = None
+        self._process = None
+        self._stop_event = None
 
+        # Buffers filled in place on every update: colorwheel output and
+        # normalized led values
         self._rgb = [0.,0.,0.]
+        self._out = [0,0,0]
+
+        # State from the last update
+        self._time_in_seconds = 0
+        self._bright_scalar = 1.0
+        self._ambient = 1.0
+        self._values = None
+
+        # Number of update deadlines the run loop has missed
+        self._missed_deadlines = 0
+
+        # Parameters that can be changed while running live in shared memory.
+        # The run loop picks up changes at the start of each update.
+        self._control = ControlBlock(brightness=self._brightness,
+                                     min_brightness=self._min_brightness,
+                                     update_interval=self._update_interval)
+        self._control_generation = self._control.generation
+        self._wheel_params = (None,None,None)
+        self._paused = False
+
+        # Currently no control socket
+        self._control_path = None
+        self._control_mode = 0o600
+        self._control_poll = 0.05
+        self._control_server = None
+
+    def _sync_control(self):
+        """
+        Apply any changes made to the shared control block since the last
+        call.  Returns True if anything changed.
+        """
+
+        if self._control.generation == self._control_generation:
+            return False
+
+        self._control_generation, values = self._control.read()
+
+        self._brightness = values["brightness"]
+        self._min_brightness = values["min_brightness"]
+        self._update_interval = values["update_interval"]
+        self._paused = bool(values["paused"])
+
+        wheel_params = (values["seconds_per_cycle"],
+                        values["zero_position"],
+                        values["counterclockwise"])
+        if wheel_params != self._wheel_params:
+            self._wheel_params = wheel_params
+
+            counterclockwise = values["counterclockwise"]
+            if counterclockwise is not None:
+                counterclockwise = bool(counterclockwise)
+
+            if self._colorwheel is not None:
+                self._colorwheel.configure(seconds_per_cycle=values["seconds_per_cycle"],
+                                           zero_position=values["zero_position"],
+                                           counterclockwise=counterclockwise)
+
+        return True
+
+    def _seconds_since_midnight(self):
+        """
+        Current time in (fractional) seconds since midnight.
+        """
+
+        return self._time_source.seconds_since_midnight()
 
     def _update(self):
         """
         Update the clock.
         """  
 
-        # Get the current time.
-        now = datetime.datetime.now()
+        metrics = self._metrics
+        start = None
+        if metrics is not None:
+            start = time.perf_counter()
+
+        # Grab any parameter changes made while running
+        self._sync_control()
 
-        # Convert into seconds since midnight
-        time_in_seconds = (now.hour*60 + now.minute)*60 + now.second
+        # Leave the leds alone while paused
+        if self._paused:
+            return
+
+        # Get the current time in seconds since midnight
+        time_in_seconds = self._seconds_since_midnight()
+        if not self._subsecond:
+            time_in_seconds = int(time_in_seconds)
+        self._time_in_seconds = time_in_seconds
+
+        # Give each led its own color
+        if self._layout is not None:
+            self._update_frame(time_in_seconds,metrics,start)
+            return
 
         # Update the RGB values with this new time 
+        rgb = self._rgb
         if self._colorwheel is not None:
-            self._rgb = self._colorwheel.rgb(time_in_seconds)[:]
+            if self._wheel_takes_out:
+                self._colorwheel.rgb(time_in_seconds,rgb)
+            else:
+                rgb[:] = self._colorwheel.rgb(time_in_seconds)
 
-        # Set the brightness, imposing limit that forces value to be between
-        # 1 and the minimum brightness. 
-        bright_scalar = self.brightness*self.ambient_brightness
-        if bright_scalar > 1:
-            bright_scalar = 1.0
-        if bright_scalar < self._min_brightness:
-            bright_scalar = self._min_brightness
+        if metrics is not None:
+            wheel_done = time.perf_counter()
+            metrics.record("colorwheel",wheel_done - start)
+
+        bright_scalar = self._calc_bright_scalar()
+
+        if metrics is not None:
+            sensor_done = time.perf_counter()
+            metrics.record("light_sensor",sensor_done - wheel_done)
 
         # Normalize channels so intensity is always sum(rgb)*bright_scalar.
         # This keeps the intensity the same, whether light is coming from
-        # one, two, or three output channels
-        total = sum(self.rgb)
-        values = []
-        for i in range(3):
-            values.append(int(round(255*bright_scalar*self.rgb[i]/total,0)))
-
-        # Set the LEDs to have desired RGB valuse
-        values = tuple(values)
+        # one, two, or three output channels.  Black stays black.
+        total = rgb[0] + rgb[1] + rgb[2]
+        if total == 0:
+            total = 1
+        out = self._out
+        if self._fixed_point and self._output_stage is None:
+            _fixed.normalize(rgb,bright_scalar,out)
+        elif self._output_stage is None:
+            for i in range(3):
+                out[i] = int(round(255*bright_scalar*rgb[i]/total,0))
+        else:
+            levels = self._levels
+            for i in range(3):
+                levels[i] = 255*bright_scalar*rgb[i]/total
+            self._output_stage.apply(levels,out)
+
+        # Fade rather than jump to big changes in output
+        if self._transition is not None:
+            out = self._transition.step(self._values,out,self._time_source.monotonic())
+
+        # Set the LEDs to have desired RGB values, skipping the write if
+        # nothing changed since the last update.
+        last = self._values
+        changed = last is None or \
+                  out[0] != last[0] or out[1] != last[1] or out[2] != last[2]
+
+        if self._recorder is not None:
+            self._recorder.append(time_in_seconds,rgb,self._ambient,
+                                  bright_scalar,out,changed)
+
+        if not changed:
+            if metrics is not None:
+                metrics.count("updates")
+                metrics.count("suppressed_writes")
+                metrics.record("update",time.perf_counter() - start)
+            return
+        values = (out[0],out[1],out[2])
+        self._values = values
+
         if self._led is not None:
             self._led.set(values)
 
-    def _run(self):
+        if metrics is not None:
+            end = time.perf_counter()
+            metrics.count("updates")
+            metrics.count("writes")
+            metrics.record("led",end - sensor_done)
+            metrics.record("update",end - start)
+
+    def _calc_bright_scalar(self):
+        """
+        Read the ambient brightness and work out the brightness scalar.
+        """
+
+        # Set the brightness, imposing limit that forces value to be between
+        # 1 and the minimum brightness. 
+        self._ambient = self.ambient_brightness
+
+        bright_scalar = calc_bright_scalar(self._brightness,
+                                           self._ambient,
+                                           self._min_brightness)
+        self._bright_scalar = bright_scalar
+
+        return bright_scalar
+
+    def _update_frame(self,time_in_seconds,metrics,start):
+        """
+        Update the clock when a layout is in use: evaluate the colorwheel for
+        every led in one batch and send the whole frame to the leds.
+        """
+
+        if self._colorwheel is None:
+            return
+
+        # Time shown by each led, wrapping at midnight like _update
+        times = self._frame_times
+        np.add(self._layout.offsets,time_in_seconds,out=times)
+        if not self._subsecond:
+            np.floor(times,out=times)
+        np.mod(times,86400,out=times)
+
+        rgb = self._colorwheel.rgb_many(times)
+        self._rgb[:] = rgb[0].tolist()
+
+        if metrics is not None:
+            wheel_done = time.perf_counter()
+            metrics.record("colorwheel",wheel_done - start)
+
+        bright_scalar = self._calc_bright_scalar()
+
+        if metrics is not None:
+            sensor_done = time.perf_counter()
+            metrics.record("light_sensor",sensor_done - wheel_done)
+
+        if self._fixed_point and self._output_stage is None:
+            frame = _fixed.normalize_many(rgb,bright_scalar*self._layout.weights)
+        elif self._output_stage is None:
+            frame = normalize(rgb,bright_scalar*self._layout.weights)
+        else:
+            levels = scale(rgb,bright_scalar*self._layout.weights)
+            frame = self._output_stage.apply_many(levels)
+
+        # Fade rather than jump to big changes in output
+        if self._transition is not None:
+            frame = self._transition.step(self._values,frame,self._time_source.monotonic())
+
+        # Skip the write if the frame did not change
+        changed = self._values is None or not np.array_equal(frame,self._values)
+
+        if self._recorder is not None:
+            self._recorder.append(time_in_seconds,rgb,self._ambient,
+                                  bright_scalar,frame,changed)
+
+        if not changed:
+            if metrics is not None:
+                metrics.count("updates")
+                metrics.count("suppressed_writes")
+                metrics.record("update",time.perf_counter() - start)
+            return
+        self._values = frame
+
+        if self._led is not None:
+            self._led.set(frame)
+
+        if metrics is not None:
+            end = time.perf_counter()
+            metrics.count("updates")
+            metrics.count("writes")
+            metrics.record("led",end - sensor_done)
+            metrics.record("update",end - start)
+
+    def _time_to_next_change(self):
+        """
+        Work out how many seconds from now the LED output will next change,
+        assuming the ambient brightness stays where it is.  Returns at most
+        max_sleep.  If the colorwheel cannot be evaluated in batch, return the
+        update interval.
+        """
+
+        if self._colorwheel is None:
+            return self._max_sleep
+
+        # Frames and dithered output are not predicted
+        if self._layout is not None:
+            return self._update_interval
+
+        if self._output_stage is not None and self._output_stage.dither:
+            return self._update_interval
+
+        try:
+            self._colorwheel.rgb_many
+        except AttributeError:
+            return self._update_interval
+
+        # Output for every time _update could see over the next max_sleep
+        # seconds (whole seconds, or update_interval steps if subsecond),
+        # wrapping at midnight the same way _update does.
+        if self._subsecond:
+            step = self._update_interval
+        else:
+            step = 1
+        horizon = int(math.ceil(self._max_sleep/step))
+        steps = np.arange(1,horizon + 1)*step
+        times = (self._time_in_seconds + steps) % 86400
+
+        rgb = self._colorwheel.rgb_many(times)
+        if self._fixed_point and self._output_stage is None:
+            values = _fixed.normalize_many(rgb,self._bright_scalar)
+        elif self._output_stage is None:
+            values = normalize(rgb,self._bright_scalar)
+        else:
+            values = self._output_stage.lookup_many(scale(rgb,self._bright_scalar))
+
+        changed = np.any(values != np.array(self._values),axis=1)
+        if not np.any(changed):
+            return self._max_sleep
+
+        # The output changes at the start of the first changed step.  Wake
+        # just after that boundary.
+        next_change = self._time_in_seconds + steps[np.argmax(changed)]
+
+        return self._delay_until(next_change)
+
+    def _delay_until(self,next_change):
+        """
+        Seconds from now until next_change (seconds since midnight of the day
+        of the last update, so it can run past 86400), plus a millisecond.
+        Never negative and at most max_sleep.
+        """
+
+        # If midnight has passed since the last update, now is on the next day
+        now = self._seconds_since_midnight()
+        if now < self._time_in_seconds - 43200:
+            now += 86400
+
+        # A change that is already due should happen right away
+        delay = max(next_change - now,0)
+
+        return min(delay + 0.001,self._max_sleep)
+
+    def _naps_until_change(self):
+        """
+        Generator yielding how long to sleep (in naps of at most
+        sensor_interval) until the LED output is predicted to change.  Stops
+        early if the ambient brightness moves by more than
+        ambient_threshold, the clock parameters are changed, or the clock is
+        asked to stop.
+        """
+
+        # Generation applied by the last update.  Any change made after it
+        # (in this process or another) ends the nap.
+        generation = self._control_generation
+        remaining = self._time_to_next_change()
+
+        while remaining > 0:
+            nap = min(remaining,self._sensor_interval)
+            yield nap
+            remaining -= nap
+
+            if self._stop_requested():
+                return
+
+            # Parameters were changed while sleeping
+            if self._control.generation != generation:
+                return
+
+            if self._light_sensor is None:
+                continue
+
+            if abs(self.ambient_brightness - self._ambient) > self._ambient_threshold:
+                return
+
+    def _next_deadline(self,deadline,interval):
+        """
+        Check deadline (on the time source's monotonic clock).  If it has
+        already passed, record how many update deadlines (spaced interval
+        apart) were missed and move to the next one that is still in the
+        future.  Returns the deadline and the time to sleep until it.
         """
-        Loop that updates clock every update_interval seconds.
+
+        now = self._time_source.monotonic()
+        if now > deadline:
+            missed = int((now - deadline)//interval) + 1
+            self._missed_deadlines += missed
+            deadline += missed*interval
+            if self._metrics is not None:
+                self._metrics.count("missed_deadlines",missed)
+
+        return deadline, deadline - now
+
+    def _write_metrics(self):
+        """
+        Write the metrics file if one was requested and it is due.
+        """
+
+        if self._metrics_file is None:
+            return
+
+        now = self._time_source.monotonic()
+        if now < self._next_metrics_write:
+            return
+
+        self._next_metrics_write = now + self._metrics_interval
+        try:
+            self._metrics.write(self._metrics_file)
+        except OSError as e:
+            sys.stderr.write("could not write metrics file: {}\n".format(e))
+
+    def _stop_requested(self):
+        """
+        Whether the run loop has been asked to stop.
+        """
+
+        return self._stop_event is not None and self._stop_event.is_set()
+
+    def _schedule(self,duration=None):
+        """
+        Generator that runs the update loop.  It updates the clock and then
+        yields how long to sleep before continuing; the runner does the actual
+        sleeping.  Updates happen every update_interval seconds or, if
+        event_driven, whenever the output is expected to change.  Updates are
+        scheduled against fixed deadlines, so the time spent in _update does
+        not make the clock drift.  If duration is given, stop once that many
+        seconds (according to the time source) have passed.
         """    
 
-        while True:
+        clock = self._time_source
+
+        # Sensors that sample in the background do so in the process that
+        # runs the loop
+        self._start_light_sensor()
+
+        # The control socket is served by whichever process runs the loop
+        if self._control_path is not None and self._control_server is None:
+            from .control import ControlServer
+            self._control_server = ControlServer(self,
+                                                 self._control_path,
+                                                 self._control_mode)
+
+        self._next_metrics_write = clock.monotonic()
+
+        deadline = clock.monotonic()
+        stop_at = None
+        if duration is not None:
+            stop_at = deadline + duration
+
+        while stop_at is None or clock.monotonic() < stop_at:
+
+            if self._stop_requested():
+                return
+
+            if self._metrics is not None:
+                self._metrics.record_lateness(max(clock.monotonic() - deadline,0.0))
+                self._write_metrics()
+
             self._update()
-            time.sleep(self._update_interval)
+
+            # Run at the transition frame rate while a fade is in progress
+            fading = self._transition is not None and self._transition.active
+            if fading:
+                interval = self._transition.frame_interval
+            else:
+                interval = self._update_interval
+
+            if self._event_driven and not fading:
+                yield from self._naps_until_change()
+                deadline = clock.monotonic()
+            else:
+                deadline, delay = self._next_deadline(deadline + interval,interval)
+                yield delay
+
+    def _sleep(self,seconds):
+        """
+        Sleep using the time source, waking early if the clock is asked to
+        stop.  If there is a control socket, serve it while sleeping and wake
+        early if a request changes the clock.
+        """
+
+        server = self._control_server
+        if server is None:
+            self._time_source.sleep(seconds,self._stop_event)
+            return
+
+        # Simulated time cannot be waited on; just handle waiting requests
+        if not isinstance(self._time_source,SystemTime):
+            server.serve(0)
+            self._time_source.sleep(seconds,self._stop_event)
+            return
+
+        end = time.monotonic() + seconds
+        while not self._stop_requested():
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            if server.serve(min(remaining,self._control_poll)):
+                return
+
+    def _close_control_socket(self):
+        """
+        Stop serving the control socket.
+        """
+
+        if self._control_server is not None:
+            self._control_server.close()
+            self._control_server = None
+
+    def _start_light_sensor(self):
+        """
+        Start the light sensor's background sampling, if it has any (see
+        colorchron.light_sensor.Sampler).
+        """
+
+        try:
+            start = self._light_sensor.start
+        except AttributeError:
+            return
+
+        start()
+
+    def _stop_light_sensor(self):
+        """
+        Stop the light sensor's background sampling, if it has any.
+        """
+
+        try:
+            stop = self._light_sensor.stop
+        except AttributeError:
+            return
+
+        stop()
+
+    def _shutdown(self):
+        """
+        Leave the leds in a well-defined state once the run loop exits.
+        """
+
+        self._close_control_socket()
+        self._stop_light_sensor()
+
+        if self._recorder is not None:
+            self._recorder.flush()
+
+        if self._led is None or self._on_stop == "hold":
+            return
+
+        self._led.set((0,0,0))
+        self._values = None
+
+    def _run(self,duration=None):
+        """
+        Run the update loop, then blank or hold the leds.
+        """
+
+        try:
+            for delay in self._schedule(duration):
+                self._sleep(delay)
+        finally:
+            self._shutdown()
+
+    def run(self,duration=None):
+        """
+        Run the clock in the current thread (blocking).  If duration is given,
+        return after that many seconds according to the clock's time source.
+        Another thread can end the run early with stop().
+        """
+
+        if self._running:
+            err = "clock is already running.\n"
+            raise RuntimeError(err)
+
+        self._stop_event = threading.Event()
+        self._runner = "run"
+        self._running = True
+        try:
+            self._run(duration)
+        finally:
+            self._running = False
+            self._runner = None
  
-    def start(self):
+    def start(self,runner="process"):
         """
-        Start the clock on its own thread.
+        Start the clock in the background.
+
+        runner: "process" runs the clock in its own process.  "thread" runs it
+                on a thread in this process, which uses less memory and lets
+                this process see the clock state (e.g. Clock.rgb).
         """
 
         # If already running, do not start
         if self._running:
             return
 
-        self._process = multiprocessing.Process(target=self._run)
+        if runner == "process":
+            self._stop_event = multiprocessing.Event()
+            self._process = multiprocessing.Process(target=self._run)
+        elif runner == "thread":
+            self._stop_event = threading.Event()
+            self._process = threading.Thread(target=self._run,daemon=True)
+        else:
+            err = "runner must be 'process' or 'thread'.\n"
+            raise ValueError(err)
+
+        self._runner = runner
         self._process.start()
         self._running = True
  
-    def stop(self):
+    def stop(self,timeout=5.0):
         """
-        Stop the clock.
+        Stop the clock.  The run loop finishes its current update, then blanks
+        or holds the leds (see on_stop) before exiting.
+
+        timeout: seconds to wait for the loop to exit.  A process that has not
+                 exited by then is terminated.
         """           
 
         # Do not running, do not stop
         if not self._running:
             return
 
-        self._process.terminate()
+        self._stop_event.set()
+
+        if self._runner == "run":
+            return
+
+        self._process.join(timeout)
+        if self._runner == "process" and self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+
+        self._process = None
+        self._runner = None
         self._running = False
 
     def add_colorwheel(self,colorwheel):
 
+        if self._fixed_point and not isinstance(colorwheel,_fixed.FixedPoint):
+            colorwheel = _fixed.FixedPoint(colorwheel)
+
         self._colorwheel = colorwheel
         try:
             self._colorwheel.rgb
@@ -133,22 +863,255 @@ class Clock:
             err = "colorwheel must have 'rgb' attribute.\n"
             raise ValueError(err)
 
-    def add_led(self,led):
+        # Wheels that can write into our buffer save an allocation per update
+        try:
+            parameters = inspect.signature(self._colorwheel.rgb).parameters
+            self._wheel_takes_out = "out" in parameters
+        except (TypeError,ValueError):
+            self._wheel_takes_out = False
+
+        # Wheel parameter changes apply to the previous wheel
+        self._wheel_params = (None,None,None)
+        self._control.set(seconds_per_cycle=None,
+                          zero_position=None,
+                          counterclockwise=None)
+
+    def set_wheel_params(self,
+                         seconds_per_cycle=None,
+                         zero_position=None,
+                         counterclockwise=None):
         """
+        Change the parameters of the colorwheel.  This can be done while the
+        clock is running; the change is applied on the next update.  Arguments
+        left as None are not changed.
+
+        seconds_per_cycle: number of seconds to sweep the entire wheel.
+        zero_position:     wheel position, in degrees, corresponding to 0
+                           seconds.
+        counterclockwise:  go counterclockwise around the wheel (True or False)
         """
 
-        self._led = led
+        if self._colorwheel is None:
+            err = "no colorwheel has been added.\n"
+            raise ValueError(err)
+
+        try:
+            self._colorwheel.configure
+        except AttributeError:
+            err = "colorwheel cannot be configured.  Must have 'configure' attribute.\n"
+            raise ValueError(err)
+
+        # Apply to our copy of the wheel first; this checks the values
+        self._colorwheel.configure(seconds_per_cycle=seconds_per_cycle,
+                                   zero_position=zero_position,
+                                   counterclockwise=counterclockwise)
+
+        values = {}
+        if seconds_per_cycle is not None:
+            values["seconds_per_cycle"] = seconds_per_cycle
+        if zero_position is not None:
+            values["zero_position"] = zero_position
+        if counterclockwise is not None:
+            values["counterclockwise"] = bool(counterclockwise)
+
+        self._control.set(**values)
+
+    def add_led(self,led,**kwargs):
+        """
+        Add leds.  led is either a driver instance or the name of a registered
+        driver (see colorchron.led.available()).  If a name is given, the
+        keyword arguments are passed to the driver.
+        """
+
+        if isinstance(led,str):
+            led = _led.create(led,**kwargs)
+
         try:
-            self._led.set
+            led.set
         except AttributeError:
             err = "LEDs not available.  Must have 'set' attribute.\n"
             raise ValueError(err)
 
-    def add_ambient_light_sensor(self,light_sensor):
+        if self._layout is not None:
+            self._check_led(led,self._layout)
+
+        self._led = led
+
+    def _check_led(self,led,layout):
         """
-        Add an ambient light sensor.
+        Make sure led has one led per layout position.  Leds without a
+        num_leds attribute are not checked.
         """
 
+        try:
+            num_leds = led.num_leds
+        except AttributeError:
+            return
+
+        if num_leds != len(layout.offsets):
+            err = "layout has {} positions, but the leds have num_leds {}.\n".format(len(layout.offsets),num_leds)
+            raise ValueError(err)
+
+    def add_layout(self,layout):
+        """
+        Give each led its own view of the colorwheel (see colorchron.spatial).
+        The colorwheel must have an 'rgb_many' attribute, and the leds must
+        accept a num_leds x 3 frame.  Pass None to go back to showing one color
+        on every led.
+        """
+
+        if layout is None:
+            if self._recorder is not None:
+                self._check_recorder(self._recorder,None)
+            self._layout = None
+            self._frame_times = None
+            self._values = None
+            return
+
+        try:
+            layout.offsets
+            layout.weights
+        except AttributeError:
+            err = "layout must have 'offsets' and 'weights' attributes.\n"
+            raise ValueError(err)
+
+        if self._colorwheel is not None:
+            try:
+                self._colorwheel.rgb_many
+            except AttributeError:
+                err = "layouts need a colorwheel with an 'rgb_many' attribute.\n"
+                raise ValueError(err)
+
+        if self._led is not None:
+            self._check_led(self._led,layout)
+
+        if self._recorder is not None:
+            self._check_recorder(self._recorder,layout)
+
+        self._layout = layout
+        self._frame_times = np.zeros(len(layout.offsets),dtype=float)
+        self._values = None
+
+    def add_output_stage(self,output_stage):
+        """
+        Add an output stage (see colorchron.output.OutputStage) applied to the
+        normalized channel levels before they are sent to the leds.  Pass None
+        to remove it.
+        """
+
+        if output_stage is not None:
+            try:
+                output_stage.apply
+                output_stage.apply_many
+            except AttributeError:
+                err = "output stage must have 'apply' and 'apply_many' attributes.\n"
+                raise ValueError(err)
+
+        self._output_stage = output_stage
+        self._values = None
+
+    def add_transition(self,transition):
+        """
+        Fade between outputs rather than jumping when the output changes
+        abruptly (see colorchron.transition.Transition).  Pass None to remove
+        it.
+        """
+
+        if transition is not None:
+            try:
+                transition.step
+                transition.active
+                transition.frame_interval
+            except AttributeError:
+                err = "transition must have 'step', 'active' and 'frame_interval' attributes.\n"
+                raise ValueError(err)
+
+        self._transition = transition
+
+    def add_recorder(self,recorder):
+        """
+        Record every update (see colorchron.recorder.Recorder).  Pass None to
+        stop recording.
+        """
+
+        if recorder is not None:
+            try:
+                recorder.append
+                recorder.flush
+            except AttributeError:
+                err = "recorder must have 'append' and 'flush' attributes.\n"
+                raise ValueError(err)
+
+            self._check_recorder(recorder,self._layout)
+
+        self._recorder = recorder
+
+    def _check_recorder(self,recorder,layout):
+        """
+        Make sure recorder holds as many leds per update as the clock shows:
+        one per layout position, or 1 without a layout.  Recorders without a
+        num_leds attribute are not checked.
+        """
+
+        try:
+            num_leds = recorder.num_leds
+        except AttributeError:
+            return
+
+        expected = 1
+        if layout is not None:
+            expected = len(layout.offsets)
+
+        if num_leds != expected:
+            err = "recorder has num_leds {}, but the clock shows {} led(s) per update.\n".format(num_leds,expected)
+            raise ValueError(err)
+
+    def add_control_socket(self,path,mode=0o600,poll_interval=0.05):
+        """
+        Serve a Unix-domain control socket at path while the clock runs (see
+        colorchron.control).  Pass None to remove it.
+
+        path: path of the socket file.
+        mode: permissions of the socket file.
+        poll_interval: longest time, in seconds, the run loop waits on the
+                       socket before checking whether it has been asked to
+                       stop.
+        """
+
+        if poll_interval <= 0:
+            err = "poll interval must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._control_path = path
+        self._control_mode = mode
+        self._control_poll = poll_interval
+
+    def pause(self):
+        """
+        Stop updating the leds (they hold their current color) until resume
+        is called.  Works while the clock is running in another process.
+        """
+
+        self._control.set(paused=1)
+
+    def resume(self):
+        """
+        Resume updating the leds after pause.
+        """
+
+        self._control.set(paused=0)
+
+    def add_ambient_light_sensor(self,light_sensor,**kwargs):
+        """
+        Add an ambient light sensor.  light_sensor is either a sensor instance
+        or the name of a registered driver (see
+        colorchron.light_sensor.available()).  If a name is given, the keyword
+        arguments are passed to the driver.
+        """
+
+        if isinstance(light_sensor,str):
+            light_sensor = _light_sensor.create(light_sensor,**kwargs)
+
         self._light_sensor = light_sensor
         try:
             self._light_sensor.brightness
@@ -163,29 +1126,105 @@ class Clock:
         means the brightness can be adjusted while the clock is running.
         """       
  
-        return self._brightness
+        return self._control.get("brightness")
 
     @brightness.setter
     def brightness(self,brightness):
         """
-        Set the brightness.
+        Set the brightness.  The running clock picks up the new value on its
+        next update.
         """
 
         if brightness < 0 or brightness > 1:
             err = "Brightness must be between zero and 1.\n"
             raise ValueError(err)
 
-        self._brightness = float(brightness)
+        self._control.set(brightness=float(brightness))
 
-        # Make the thread come up for air and grab the new brightness value
-        if self._running:
-            self.stop()
-            self.start()
+    @property
+    def min_brightness(self):
+        """
+        Minimum brightness of the clock.  Can be adjusted while the clock is
+        running.
+        """
+
+        return self._control.get("min_brightness")
+
+    @min_brightness.setter
+    def min_brightness(self,min_brightness):
+
+        if min_brightness < 0 or min_brightness > 1:
+            err = "minimum brightness must be between 0 and 1.\n"
+            raise ValueError(err)
+
+        self._control.set(min_brightness=float(min_brightness))
+
+    @property
+    def update_interval(self):
+        """
+        How often to update the clock in seconds.  Can be adjusted while the
+        clock is running.
+        """
+
+        return self._control.get("update_interval")
+
+    @update_interval.setter
+    def update_interval(self,update_interval):
+
+        if update_interval <= 0:
+            err = "update interval must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._control.set(update_interval=float(update_interval))
+
+    @property
+    def paused(self):
+        """
+        Whether the clock is paused.  Read from the shared control block, so
+        it is current even if the clock is running in another process.
+        """
+
+        return bool(self._control.get("paused"))
+
+    @property
+    def values(self):
+        """
+        Values last sent to the leds (a 3-tuple, or a num_leds x 3 frame if a
+        layout is used), or None.
+        """
+
+        return self._values
 
     @property
     def rgb(self): 
+        """
+        RGB value from the colorwheel at the last update.  This list is
+        updated in place.
+        """
+
         return self._rgb
 
+    def metrics(self):
+        """
+        Dictionary of update timings (seconds) and counters, or None if the
+        clock was created without metrics.  Note that a clock started with
+        start() collects metrics in its own process; use metrics_file to see
+        them from outside.
+        """
+
+        if self._metrics is None:
+            return None
+
+        return self._metrics.snapshot()
+
+    @property
+    def missed_deadlines(self):
+        """
+        Number of update deadlines missed because an update ran long.
+        """
+
+        return self._missed_deadlines
+
     @property
     def ambient_brightness(self):
         """
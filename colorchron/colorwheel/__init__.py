@@ -1,2 +1,4 @@
 
 from .wheels import RGB, CMY, HSV, RYB, Chromachron
+from .gradient import Gradient
+from .lut import LookupTable
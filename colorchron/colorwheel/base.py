@@ -1,6 +1,21 @@
 
+import numpy as np
+
 class ColorWheel:
 
+    # Bump when a change to the code alters the output of a wheel, so lookup
+    # tables cached from the old output are not reused
+    _cache_version = 1
+
+    __slots__ = ("_seconds_per_cycle",
+                 "_zero_position",
+                 "_counterclockwise",
+                 "_fx_zero",
+                 "_single_channel",
+                 "_three_channel",
+                 "_three_channel_offsets",
+                 "_intervals")
+
     def __init__(self,
                  seconds_per_cycle=86400,
                  zero_position=240,
@@ -17,6 +32,14 @@ class ColorWheel:
         self._zero_position = zero_position
         self._counterclockwise = bool(counterclockwise)
 
+        self._configure()
+
+    def _configure(self):
+        """
+        Check the wheel parameters and calculate everything derived from
+        them.
+        """
+
         if self._seconds_per_cycle <= 0:
             err = "seconds_per_cycle must be greater than zero.\n"
             raise ValueError(err)
@@ -38,6 +61,34 @@ class ColorWheel:
         # Configure intervals for cycling the clock
         self._intervals = [1/6.,3/6.,4/6.]
 
+    def configure(self,
+                  seconds_per_cycle=None,
+                  zero_position=None,
+                  counterclockwise=None):
+        """
+        Change the wheel parameters in place.  Arguments left as None are not
+        changed.  See __init__ for a description of the arguments.
+        """
+
+        old = (self._seconds_per_cycle,
+               self._zero_position,
+               self._counterclockwise)
+
+        if seconds_per_cycle is not None:
+            self._seconds_per_cycle = seconds_per_cycle
+        if zero_position is not None:
+            self._zero_position = zero_position
+        if counterclockwise is not None:
+            self._counterclockwise = bool(counterclockwise)
+
+        try:
+            self._configure()
+        except ValueError:
+            (self._seconds_per_cycle,
+             self._zero_position,
+             self._counterclockwise) = old
+            raise
+
     def _calc_channel_values(self,time):
         """
         Calculate the channel values corresponding to this time.
@@ -78,12 +129,97 @@ class ColorWheel:
             # Hold at 0 for the 5th and 6th sixth of the clock
             self._three_channel[i] = 0.0
 
+    def _calc_channel_values_many(self,times):
+        """
+        Calculate the channel values for an array of times.  Returns a tuple
+        holding the single channel values (N array) and three channel values
+        (N x 3 array).  Does not touch the state used by the scalar methods,
+        so it is safe to call on a wheel that is also driving a clock.
+        """
+
+        times = np.asarray(times,dtype=float).reshape(-1)
+        offsets = np.array(self._three_channel_offsets,dtype=float)
+
+        # Figure out how far around the clock we should be
+        channel_time = times[:,None] + offsets[None,:]
+        fx_time = (channel_time % self._seconds_per_cycle)/self._seconds_per_cycle
+
+        # Run counter clockwise if requested
+        if self._counterclockwise:
+            fx_time = 1 - fx_time
+
+        # Ramp up, hold at 1, ramp down, hold at 0 (same pieces as the scalar
+        # calculation above)
+        m = 1/(self._intervals[1] - self._intervals[2])
+        b = 1 - self._intervals[1]*m
+        three_channel = np.select([fx_time < self._intervals[0],
+                                   fx_time < self._intervals[1],
+                                   fx_time < self._intervals[2]],
+                                  [fx_time/self._intervals[0],
+                                   1.0,
+                                   fx_time*m + b],
+                                  0.0)
+
+        return fx_time[:,0].copy(), three_channel
+
+    def _cache_params(self):
+        """
+        Parameters that (together with the class) completely determine the
+        output of the wheel.  Used to build cache keys for lookup tables.
+        Subclasses with extra parameters should extend this.
+        """
+
+        return {"seconds_per_cycle":self._seconds_per_cycle,
+                "zero_position":self._zero_position,
+                "counterclockwise":self._counterclockwise}
+
     def get_single_channel(self,time):
 
         self._calc_channel_values(time)
         return self._single_channel
 
-    def get_three_channel(self,time):
+    def get_three_channel(self,time,out=None):
+        """
+        Three channel values for time.  If out (a 3-element list) is given,
+        the values are written into it; otherwise a new list is returned.
+        """
 
         self._calc_channel_values(time)
-        return self._three_channel
+
+        if out is None:
+            return self._three_channel[:]
+
+        out[0] = self._three_channel[0]
+        out[1] = self._three_channel[1]
+        out[2] = self._three_channel[2]
+
+        return out
+
+    def get_single_channel_many(self,times):
+        """
+        Single channel values (N array) for an array of times.
+        """
+
+        return self._calc_channel_values_many(times)[0]
+
+    def get_three_channel_many(self,times):
+        """
+        Three channel values (N x 3 array) for an array of times.
+        """
+
+        return self._calc_channel_values_many(times)[1]
+
+    def rgb_many(self,times):
+        """
+        RGB values for an array of times, returned as an N x 3 uint8 array.
+        Subclasses override this with a vectorized calculation; this fallback
+        just calls rgb once per time.
+        """
+
+        times = np.asarray(times).reshape(-1)
+        out = np.empty((len(times),3),dtype=np.uint8)
+        for i, t in enumerate(times):
+            out[i] = self.rgb(t)
+
+        return out
+
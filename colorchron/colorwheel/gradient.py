@@ -0,0 +1,294 @@
+__description__ = \
+"""
+Color wheel that interpolates between arbitrary, unevenly spaced keyframes.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+from .base import ColorWheel
+
+import bisect, math
+
+import numpy as np
+
+def _srgb_to_linear(c):
+    """
+    sRGB component (0-1) to linear light.
+    """
+
+    if c <= 0.04045:
+        return c/12.92
+    return ((c + 0.055)/1.055)**2.4
+
+def _linear_to_srgb(c):
+    """
+    Linear light component to sRGB (0-1).
+    """
+
+    if c <= 0.0031308:
+        return 12.92*c
+    return 1.055*c**(1/2.4) - 0.055
+
+def _linear_to_srgb_many(c):
+    """
+    Vectorized _linear_to_srgb.
+    """
+
+    c = np.asarray(c,dtype=float)
+    high = 1.055*np.power(np.maximum(c,0.0031308),1/2.4) - 0.055
+
+    return np.where(c <= 0.0031308,12.92*c,high)
+
+def _cbrt(x):
+    return math.copysign(abs(x)**(1/3),x)
+
+def _rgb_to_oklab(rgb):
+    """
+    Convert an RGB color (0-255) to OKLab.
+    """
+
+    r, g, b = [_srgb_to_linear(c/255) for c in rgb]
+
+    l = _cbrt(0.4122214708*r + 0.5363325363*g + 0.0514459929*b)
+    m = _cbrt(0.2119034982*r + 0.6806995451*g + 0.1073969566*b)
+    s = _cbrt(0.0883024619*r + 0.2817188376*g + 0.6299787005*b)
+
+    return [0.2104542553*l + 0.7936177850*m - 0.0040720468*s,
+            1.9779984951*l - 2.4285922050*m + 0.4505937099*s,
+            0.0259040371*l + 0.7827717662*m - 0.8086757660*s]
+
+def _oklab_to_rgb(lab):
+    """
+    Convert an OKLab color to RGB (0-255, as floats).
+    """
+
+    L, a, b = lab
+
+    l = L + 0.3963377774*a + 0.2158037573*b
+    m = L - 0.1055613458*a - 0.0638541728*b
+    s = L - 0.0894841775*a - 1.2914855480*b
+
+    l = l*l*l
+    m = m*m*m
+    s = s*s*s
+
+    linear = [ 4.0767416621*l - 3.3077115913*m + 0.2309699292*s,
+              -1.2684380046*l + 2.6097574011*m - 0.3413193965*s,
+              -0.0041960863*l - 0.7034186147*m + 1.7076147010*s]
+
+    return [255*_linear_to_srgb(min(max(c,0.0),1.0)) for c in linear]
+
+def _oklab_to_rgb_many(lab):
+    """
+    Vectorized _oklab_to_rgb.  lab is an N x 3 array.
+    """
+
+    L, a, b = lab[:,0], lab[:,1], lab[:,2]
+
+    l = L + 0.3963377774*a + 0.2158037573*b
+    m = L - 0.1055613458*a - 0.0638541728*b
+    s = L - 0.0894841775*a - 1.2914855480*b
+
+    l = l*l*l
+    m = m*m*m
+    s = s*s*s
+
+    linear = np.stack(( 4.0767416621*l - 3.3077115913*m + 0.2309699292*s,
+                       -1.2684380046*l + 2.6097574011*m - 0.3413193965*s,
+                       -0.0041960863*l - 0.7034186147*m + 1.7076147010*s),
+                      axis=1)
+
+    return 255*_linear_to_srgb_many(np.clip(linear,0.0,1.0))
+
+
+class Gradient(ColorWheel):
+    """
+    Color wheel defined by keyframes.  Each keyframe is a (position,color)
+    pair, where position is the fraction of the way around the wheel (0 to 1)
+    and color is an RGB value (0-255).  Keyframes do not need to be evenly
+    spaced.  Between keyframes the color is interpolated; after the last
+    keyframe the color interpolates back around to the first.
+
+    With the default zero_position of 0 and seconds_per_cycle of 86400, the
+    position of a keyframe is just its time of day divided by 86400, so a
+    palette keyed to sunrise and sunset is:
+
+        Gradient([(6.5/24,(255,120,40)),(12/24,(255,255,255)),
+                  (19.5/24,(200,80,120)),(0,(10,10,60))])
+
+    Interpolation can be:
+        "step":       hold each keyframe color until the next keyframe
+        "linear":     linear in RGB
+        "smoothstep": eased (zero slope at each keyframe) in RGB
+        "perceptual": linear in OKLab, which keeps brightness and hue even
+                      through the blend
+    """
+
+    __slots__ = ("_keyframes",
+                 "_interpolation",
+                 "_stops",
+                 "_segments",
+                 "_stops_array",
+                 "_widths_array",
+                 "_starts_array",
+                 "_deltas_array")
+
+    _interpolations = ("step","linear","smoothstep","perceptual")
+
+    def __init__(self,
+                 keyframes,
+                 interpolation="linear",
+                 seconds_per_cycle=86400,
+                 zero_position=0,
+                 counterclockwise=False):
+        """
+        keyframes: list of (position,(r,g,b)) pairs.  position runs from 0 to
+                   1 around the wheel.
+        interpolation: "step", "linear", "smoothstep" or "perceptual".
+
+        See ColorWheel for the other arguments.
+        """
+
+        self._keyframes = keyframes
+        self._interpolation = interpolation
+        self._build_segments()
+
+        super().__init__(seconds_per_cycle,
+                         zero_position,
+                         counterclockwise)
+
+    def _build_segments(self):
+        """
+        Check the keyframes and precompute the start, inverse width and color
+        change of each segment between adjacent keyframes.
+        """
+
+        if self._interpolation not in self._interpolations:
+            err = "interpolation '{}' not recognized.  Should be one of:\n".format(self._interpolation)
+            err += "    {}\n".format(", ".join(self._interpolations))
+            raise ValueError(err)
+
+        keyframes = []
+        for keyframe in self._keyframes:
+            try:
+                position, color = keyframe
+                position = float(position)
+                color = [float(c) for c in color]
+            except (TypeError,ValueError):
+                err = "each keyframe must be a (position,(r,g,b)) pair.\n"
+                raise ValueError(err)
+
+            if position < 0 or position >= 1:
+                err = "keyframe positions must be >= 0 and < 1.\n"
+                raise ValueError(err)
+
+            if len(color) != 3 or min(color) < 0 or max(color) > 255:
+                err = "keyframe colors must be three values between 0 and 255.\n"
+                raise ValueError(err)
+
+            keyframes.append((position,color))
+
+        if len(keyframes) == 0:
+            err = "at least one keyframe must be given.\n"
+            raise ValueError(err)
+
+        keyframes.sort(key=lambda k: k[0])
+        positions = [k[0] for k in keyframes]
+        if len(set(positions)) != len(positions):
+            err = "keyframe positions must be unique.\n"
+            raise ValueError(err)
+
+        # Colors are interpolated in OKLab for perceptual blending, RGB
+        # otherwise
+        if self._interpolation == "perceptual":
+            colors = [_rgb_to_oklab(k[1]) for k in keyframes]
+        else:
+            colors = [k[1] for k in keyframes]
+
+        # Segment i runs from keyframe i to keyframe i + 1; the last segment
+        # wraps around to the first keyframe
+        segments = []
+        for i in range(len(keyframes)):
+            j = (i + 1) % len(keyframes)
+            end = positions[j]
+            if j == 0:
+                end += 1.0
+
+            start = colors[i]
+            delta = [colors[j][k] - start[k] for k in range(3)]
+            segments.append((positions[i],1/(end - positions[i]),start,delta))
+
+        self._stops = positions
+        self._segments = segments
+
+        self._stops_array = np.array(positions,dtype=float)
+        self._widths_array = np.array([s[1] for s in segments],dtype=float)
+        self._starts_array = np.array([s[2] for s in segments],dtype=float)
+        self._deltas_array = np.array([s[3] for s in segments],dtype=float)
+
+    def _cache_params(self):
+
+        params = super()._cache_params()
+        params["keyframes"] = [[p,list(c)] for p, c in self._keyframes]
+        params["interpolation"] = self._interpolation
+
+        return params
+
+    def rgb(self,time,out=None):
+
+        fx = self.get_single_channel(time)
+
+        # Find the segment holding fx.  Anything before the first keyframe
+        # belongs to the segment wrapping around from the last one.
+        i = bisect.bisect_right(self._stops,fx) - 1
+        if i < 0:
+            i = len(self._stops) - 1
+            fx += 1.0
+        position, inv_width, start, delta = self._segments[i]
+
+        if out is None:
+            out = [0,0,0]
+
+        interpolation = self._interpolation
+        if interpolation == "step":
+            for k in range(3):
+                out[k] = int(math.floor(start[k] + 0.5))
+            return out
+
+        t = (fx - position)*inv_width
+        if interpolation == "smoothstep":
+            t = t*t*(3 - 2*t)
+
+        values = [start[k] + delta[k]*t for k in range(3)]
+        if interpolation == "perceptual":
+            values = _oklab_to_rgb(values)
+
+        for k in range(3):
+            out[k] = int(math.floor(values[k] + 0.5))
+
+        return out
+
+    def rgb_many(self,times):
+
+        fx = self.get_single_channel_many(times)
+
+        i = np.searchsorted(self._stops_array,fx,side="right") - 1
+        wrapped = i < 0
+        i[wrapped] = len(self._stops) - 1
+        fx = np.where(wrapped,fx + 1.0,fx)
+
+        start = self._starts_array[i]
+
+        interpolation = self._interpolation
+        if interpolation == "step":
+            return np.floor(start + 0.5).astype(np.uint8)
+
+        t = (fx - self._stops_array[i])*self._widths_array[i]
+        if interpolation == "smoothstep":
+            t = t*t*(3 - 2*t)
+
+        values = start + self._deltas_array[i]*t[:,None]
+        if interpolation == "perceptual":
+            values = _oklab_to_rgb_many(values)
+
+        return np.clip(np.floor(values + 0.5),0,255).astype(np.uint8)
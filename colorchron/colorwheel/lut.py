@@ -0,0 +1,206 @@
+__description__ = \
+"""
+Precomputed lookup tables for colorwheels.  Every wheel is a pure function of
+its parameters and the time, so the whole cycle can be calculated once at
+one-second resolution, saved to disk, and memory-mapped on later startups.
+Each call to rgb then becomes a single index into the table.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import os, json, hashlib, tempfile
+
+import numpy as np
+
+# Bump when the layout of cached tables changes
+_table_version = 1
+
+def default_cache_dir():
+    """
+    Directory used to store lookup tables if none is specified.  Respects
+    XDG_CACHE_HOME, falling back to ~/.cache/colorchron.
+    """
+
+    base = os.environ.get("XDG_CACHE_HOME",
+                          os.path.join(os.path.expanduser("~"),".cache"))
+
+    return os.path.join(base,"colorchron")
+
+class LookupTable:
+    """
+    Wrap a colorwheel so rgb(time) is read from a precomputed table rather than
+    calculated.  The table covers one full cycle at one-second resolution and
+    is stored as an seconds_per_cycle x 3 uint8 array.  Times that are not
+    whole seconds fall through to the wrapped wheel.
+
+    Use it anywhere a colorwheel is accepted:
+
+        wheel = colorchron.colorwheel.LookupTable(colorchron.colorwheel.RYB())
+        clock.add_colorwheel(wheel)
+    """
+
+    __slots__ = ("_colorwheel",
+                 "_cache_dir",
+                 "_use_cache",
+                 "_seconds_per_cycle",
+                 "_table")
+
+    def __init__(self,colorwheel,cache_dir=None,use_cache=True):
+        """
+        colorwheel: colorwheel instance to tabulate.
+        cache_dir:  directory in which to store tables. If None, use
+                    default_cache_dir().
+        use_cache:  whether to read/write tables on disk (True or False).  If
+                    False, the table is calculated in memory every time.
+        """
+
+        self._colorwheel = colorwheel
+        try:
+            self._colorwheel.rgb
+        except AttributeError:
+            err = "colorwheel must have 'rgb' attribute.\n"
+            raise ValueError(err)
+
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        self._cache_dir = cache_dir
+        self._use_cache = bool(use_cache)
+
+        self._setup()
+
+    def _setup(self):
+        """
+        Check the wrapped wheel can be tabulated and load its table.
+        """
+
+        seconds_per_cycle = self._colorwheel._seconds_per_cycle
+        if int(seconds_per_cycle) != seconds_per_cycle:
+            err = "lookup tables require an integer seconds_per_cycle.\n"
+            raise ValueError(err)
+        self._seconds_per_cycle = int(seconds_per_cycle)
+
+        self._table = self._load_table()
+
+    def configure(self,**kwargs):
+        """
+        Change the parameters of the wrapped wheel (see its configure method)
+        and switch to the table for the new parameters.  If the new parameters
+        cannot be tabulated, the wrapped wheel is put back as it was.
+        """
+
+        wheel = self._colorwheel
+        old = {"seconds_per_cycle":wheel._seconds_per_cycle,
+               "zero_position":wheel._zero_position,
+               "counterclockwise":wheel._counterclockwise}
+
+        wheel.configure(**kwargs)
+        try:
+            self._setup()
+        except ValueError:
+            wheel.configure(**old)
+            raise
+
+    @property
+    def cache_key(self):
+        """
+        Key identifying the table for this wheel configuration.
+        """
+
+        cls = type(self._colorwheel)
+        params = self._colorwheel._cache_params()
+        params["class"] = "{}.{}".format(cls.__module__,cls.__qualname__)
+        params["version"] = "{}.{}".format(_table_version,
+                                           getattr(cls,"_cache_version",1))
+
+        encoded = json.dumps(params,sort_keys=True).encode("utf-8")
+
+        return hashlib.sha1(encoded).hexdigest()
+
+    @property
+    def cache_file(self):
+        """
+        File in which the table is stored.
+        """
+
+        return os.path.join(self._cache_dir,"{}.npy".format(self.cache_key))
+
+    @property
+    def table(self):
+        """
+        seconds_per_cycle x 3 uint8 array of RGB values.
+        """
+
+        return self._table
+
+    def _calc_table(self):
+        """
+        Calculate the table for a full cycle.
+        """
+
+        times = np.arange(self._seconds_per_cycle)
+
+        return np.ascontiguousarray(self._colorwheel.rgb_many(times),
+                                    dtype=np.uint8)
+
+    def _load_table(self):
+        """
+        Memory-map the table from the cache, calculating and saving it first
+        if it is not there.
+        """
+
+        if not self._use_cache:
+            return self._calc_table()
+
+        cache_file = self.cache_file
+        if os.path.isfile(cache_file):
+            try:
+                table = np.load(cache_file,mmap_mode="r")
+                if table.shape == (self._seconds_per_cycle,3) and \
+                   table.dtype == np.uint8:
+                    return table
+            except (OSError,ValueError):
+                pass
+
+        table = self._calc_table()
+
+        # Write to a temporary file and move into place so a partially
+        # written table is never read by another process.
+        try:
+            os.makedirs(self._cache_dir,exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=self._cache_dir,suffix=".tmp")
+            with os.fdopen(fd,"wb") as f:
+                np.save(f,table)
+            os.replace(tmp_file,cache_file)
+        except OSError:
+            return table
+
+        return np.load(cache_file,mmap_mode="r")
+
+    def rgb(self,time,out=None):
+
+        index = int(time)
+        if index != time:
+            if out is None:
+                return self._colorwheel.rgb(time)
+            out[:] = self._colorwheel.rgb(time)
+            return out
+
+        row = self._table[index % self._seconds_per_cycle]
+        if out is None:
+            return row.tolist()
+
+        out[0] = int(row[0])
+        out[1] = int(row[1])
+        out[2] = int(row[2])
+
+        return out
+
+    def rgb_many(self,times):
+
+        times = np.asarray(times).reshape(-1)
+        index = times.astype(np.int64)
+        if not np.array_equal(index,times):
+            return self._colorwheel.rgb_many(times)
+
+        return self._table[index % self._seconds_per_cycle]
+
@@ -1,4 +1,6 @@
-import math
+import math, functools
+
+import numpy as np
 
 """
 Generic functions for converting between a collection of random channel colors
@@ -12,6 +14,10 @@ https://github.com/bahamas10/ryb
 
 To use, define a "magic", which is an 8 x 3 list of lists describing the
 cube mapping between the rxb colorspace and the rgb colorspace. 
+
+For repeated conversions with the same magic, use get_transform(magic) to get
+an RXBTransform.  This validates the magic once and precomputes everything
+that does not depend on the input values.
 """
  
 def _cubic_interpolate(t, A, B):
@@ -52,17 +58,11 @@ def _get_blue(iR, iY, iB, magic):
 
     return _cubic_interpolate(iR, y0, y1)
 
-def rxb_to_rgb(values, magic):
+def _check_magic(magic):
     """
-    Take values on some (arbitrarily-defined) color wheel and spit them out as
-    RGB values.  The input values are assumed to be between 0 and 1. The final
-    RGB values are also been 0 and 1. 
-
-    Magic defines the coordinate transformation.  It should be an 8x3 matrix 
-    (see description).
+    Make sure that magic is defined properly.
     """
 
-    # Make sure that magic is defined properly.  
     tests_failed = False
           
     if len(magic) != 8:
@@ -77,9 +77,113 @@ def rxb_to_rgb(values, magic):
     
         raise ValueError(err)
 
+def rxb_to_rgb(values, magic):
+    """
+    Take values on some (arbitrarily-defined) color wheel and spit them out as
+    RGB values.  The input values are assumed to be between 0 and 1. The final
+    RGB values are also been 0 and 1. 
+
+    Magic defines the coordinate transformation.  It should be an 8x3 matrix 
+    (see description).
+    """
+
+    _check_magic(magic)
+
     R1 = _get_red(*values, magic)
     G1 = _get_green(*values, magic)
     B1 = _get_blue(*values, magic)
 
     return [R1,G1,B1]
 
+
+class RXBTransform:
+    """
+    Compiled version of rxb_to_rgb for a single magic.  The magic is validated
+    once, the differences between the cube faces are precomputed, and the
+    cubic weight for each input channel is calculated once per conversion
+    rather than once per interpolation.  Results are identical to rxb_to_rgb.
+    """
+
+    def __init__(self,magic):
+        """
+        magic: 8x3 matrix defining the coordinate transformation.
+        """
+
+        _check_magic(magic)
+
+        self._magic = np.array(magic,dtype=float)
+
+        # Corners with iB = 0 and the step to the matching iB = 1 corners
+        self._low = self._magic[:4]
+        self._delta = self._magic[4:] - self._magic[:4]
+
+        # Plain python copies for the scalar path
+        self._low_list = self._low.tolist()
+        self._delta_list = self._delta.tolist()
+
+    def to_rgb(self,values,out=None):
+        """
+        Convert a single set of rxb values (each between 0 and 1) to a list of
+        rgb values between 0 and 1.  If out (a 3-element list) is given, the
+        values are written into it.
+        """
+
+        iR, iY, iB = values
+
+        wR = iR * iR * (3 - 2 * iR)
+        wY = iY * iY * (3 - 2 * iY)
+        wB = iB * iB * (3 - 2 * iB)
+
+        low = self._low_list
+        delta = self._delta_list
+
+        if out is None:
+            out = [0.,0.,0.]
+        for i in range(3):
+
+            x0 = low[0][i] + wB * delta[0][i]
+            x1 = low[1][i] + wB * delta[1][i]
+            x2 = low[2][i] + wB * delta[2][i]
+            x3 = low[3][i] + wB * delta[3][i]
+            y0 = x0 + wY * (x1 - x0)
+            y1 = x2 + wY * (x3 - x2)
+
+            out[i] = y0 + wR * (y1 - y0)
+
+        return out
+
+    def to_rgb_many(self,values):
+        """
+        Convert an N x 3 array of rxb values to an N x 3 array of rgb values.
+        """
+
+        values = np.asarray(values,dtype=float).reshape(-1,3)
+
+        w = values * values * (3 - 2 * values)
+        wR = w[:,0,None]
+        wY = w[:,1,None]
+        wB = w[:,2,None,None]
+
+        # N x 4 x 3 array of values interpolated along the iB axis
+        x = self._low[None,:,:] + wB * self._delta[None,:,:]
+
+        y0 = x[:,0] + wY * (x[:,1] - x[:,0])
+        y1 = x[:,2] + wY * (x[:,3] - x[:,2])
+
+        return y0 + wR * (y1 - y0)
+
+@functools.lru_cache(maxsize=None)
+def _get_transform(magic):
+
+    return RXBTransform(magic)
+
+def get_transform(magic):
+    """
+    Return an RXBTransform for magic, building it only the first time a given
+    magic is seen.
+    """
+
+    _check_magic(magic)
+    key = tuple(tuple(float(v) for v in m) for m in magic)
+
+    return _get_transform(key)
@@ -11,33 +11,98 @@ from .base import ColorWheel
 from . import rxb
 import colorsys, math
 
+import numpy as np
+
+def _to_uint8(values):
+    """
+    Convert an N x 3 array of channel values between 0 and 1 into an N x 3
+    uint8 array, rounding up the way the scalar rgb methods do.
+    """
+
+    return np.clip(np.ceil(255*values),0,255).astype(np.uint8)
+
+def _hsv_to_rgb_many(h,s,v):
+    """
+    Vectorized version of colorsys.hsv_to_rgb.  h is an N array; s and v are
+    scalars.  Returns an N x 3 array.
+    """
+
+    if s == 0.0:
+        return np.full((len(h),3),v,dtype=float)
+
+    i = np.floor(h*6.0)
+    f = (h*6.0) - i
+    p = v*(1.0 - s)
+    q = v*(1.0 - s*f)
+    t = v*(1.0 - s*(1.0 - f))
+    i = i.astype(int) % 6
+
+    p = np.full(len(h),p)
+    v = np.full(len(h),v)
+
+    r = np.choose(i,[v,q,p,p,t,v])
+    g = np.choose(i,[t,v,v,q,p,p])
+    b = np.choose(i,[p,p,t,v,v,q])
+
+    return np.stack((r,g,b),axis=1)
+
 class RGB(ColorWheel):
     """
     Red-Green-Blue color wheel.
     """
 
-    def rgb(self,time):
+    __slots__ = ()
+
+    def rgb(self,time,out=None):
+
+        self._calc_channel_values(time)
+        values = self._three_channel
+
+        if out is None:
+            out = [0,0,0]
+        for i in range(3):
+            out[i] = math.ceil(255*values[i])
 
-        values = self.get_three_channel(time)
+        return out
 
-        return [math.ceil(255*v) for v in values]
+    def rgb_many(self,times):
+
+        values = self.get_three_channel_many(times)
+
+        return _to_uint8(values)
 
 class CMY(ColorWheel):
     """
     Go around the Cyan-Magenta-Yellow color wheel.
     """
 
-    def rgb(self,time):
+    __slots__ = ()
+
+    def rgb(self,time,out=None):
+
+        self._calc_channel_values(time)
+        values = self._three_channel
 
-        values = self.get_three_channel(time)
+        if out is None:
+            out = [0,0,0]
+        for i in range(3):
+            out[i] = math.ceil(255*(1 - values[i]))
 
-        return [math.ceil(255*(1 - v)) for v in values]
+        return out
+
+    def rgb_many(self,times):
+
+        values = self.get_three_channel_many(times)
+
+        return _to_uint8(1 - values)
 
 class HSV(ColorWheel):
     """
     Hue color wheel, using fixed saturation and value.
     """
 
+    __slots__ = ("_saturation","_value")
+
     def __init__(self,
                  seconds_per_cycle=86400,
                  zero_position=240,
@@ -51,8 +116,16 @@ class HSV(ColorWheel):
         super().__init__(seconds_per_cycle,
                          zero_position,
                          counterclockwise)
+
+    def _cache_params(self):
+
+        params = super()._cache_params()
+        params["saturation"] = self._saturation
+        params["value"] = self._value
+
+        return params
     
-    def rgb(self,time):
+    def rgb(self,time,out=None):
         """
         RGB values are determined by a single channel.
         """
@@ -60,14 +133,29 @@ class HSV(ColorWheel):
         hue = self.get_single_channel(time)
         
         values = colorsys.hsv_to_rgb(hue,self._saturation,self._value)
-        
-        return [math.ceil(255*v) for v in values] 
+
+        if out is None:
+            out = [0,0,0]
+        for i in range(3):
+            out[i] = math.ceil(255*values[i])
+
+        return out
+
+    def rgb_many(self,times):
+
+        hue = self.get_single_channel_many(times)
+
+        values = _hsv_to_rgb_many(hue,self._saturation,self._value)
+
+        return _to_uint8(values)
 
 
 class RYB(ColorWheel):
     """
     Red-Yellow-Blue color wheel.
     """
+
+    __slots__ = ("_transform","_rxb_values")
     
     _magic = [[1,     1,     1],
               [1,     1,     0],
@@ -78,17 +166,51 @@ class RYB(ColorWheel):
               [0.5,   0.0,   0.5],
               [0.2,   0.094, 0.0]]
 
-    def rgb(self,time):
+    def __init__(self,
+                 seconds_per_cycle=86400,
+                 zero_position=240,
+                 counterclockwise=False):
+
+        super().__init__(seconds_per_cycle,
+                         zero_position,
+                         counterclockwise)
+
+        self._transform = rxb.get_transform(self._magic)
+        self._rxb_values = [0.,0.,0.]
+
+    def _cache_params(self):
+
+        params = super()._cache_params()
+        params["magic"] = self._magic
+
+        return params
 
-        values = self.get_three_channel(time)
+    def rgb(self,time,out=None):
+
+        self._calc_channel_values(time)
   
-        values = rxb.rxb_to_rgb(values,self._magic)
+        values = self._transform.to_rgb(self._three_channel,self._rxb_values)
+
+        if out is None:
+            out = [0,0,0]
+        for i in range(3):
+            out[i] = math.ceil(255*values[i])
+
+        return out
+
+    def rgb_many(self,times):
 
-        return [math.ceil(255*v) for v in values]
+        values = self.get_three_channel_many(times)
+
+        values = self._transform.to_rgb_many(values)
+
+        return _to_uint8(values)
 
 
 class Chromachron(ColorWheel):
 
+    __slots__ = ()
+
     _values = [[255,235,35],
                [255,125, 25],
                [255,194,195],
@@ -102,11 +224,34 @@ class Chromachron(ColorWheel):
                [255,215,185],
                [205,155,106]]
 
-    def rgb(self,time):
+    def _cache_params(self):
+
+        params = super()._cache_params()
+        params["values"] = self._values
+
+        return params
+
+    def rgb(self,time,out=None):
 
         time_value = self.get_single_channel(time)
        
         index = math.floor(time_value*len(self._values))
+        values = self._values[index]
+
+        if out is None:
+            out = [0,0,0]
+        out[0] = values[0]
+        out[1] = values[1]
+        out[2] = values[2]
+
+        return out
+
+    def rgb_many(self,times):
+
+        time_value = self.get_single_channel_many(times)
+
+        index = np.floor(time_value*len(self._values)).astype(int)
+        index = np.clip(index,0,len(self._values) - 1)
 
-        return self._values[index]
+        return np.array(self._values,dtype=np.uint8)[index]
      
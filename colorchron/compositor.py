@@ -0,0 +1,366 @@
+__description__ = \
+"""
+Drive several zones from one clock.  Each zone has its own colorwheel,
+brightness and leds (a whole device, or a range of pixels on a strip).  The
+time and ambient light sensor are read once per update and shared by every
+zone, each distinct colorwheel is evaluated once, all zones are normalized in
+one batch, and each device gets a single write per update however many zones
+it holds.
+
+    compositor = colorchron.compositor.Compositor()
+    compositor.add_ambient_light_sensor("cjmcu3216")
+    strip = colorchron.led.create("neopixel",num_leds=30)
+    compositor.add_zone(colorchron.colorwheel.RYB(),strip,pixels=(0,15))
+    compositor.add_zone(colorchron.colorwheel.HSV(),strip,pixels=(15,30),
+                        brightness=0.5)
+    compositor.add_zone(colorchron.colorwheel.RGB(),"gpio",
+                        pin_numbers=[17,27,22])
+    compositor.start()
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import time, math
+
+import numpy as np
+
+from .colorchron import Clock, normalize, scale
+from . import fixed as _fixed
+from . import led as _led
+
+class Compositor(Clock):
+    """
+    Clock that drives several zones from one update loop.  Takes the same
+    arguments as Clock.  Use add_zone instead of add_colorwheel and add_led.
+    """
+
+    __slots__ = ("_wheels",
+                 "_wheel_rgb",
+                 "_zone_wheel",
+                 "_zone_brightness",
+                 "_zone_pixels",
+                 "_zone_values",
+                 "_devices")
+
+    def __init__(self,*args,**kwargs):
+
+        super().__init__(*args,**kwargs)
+
+        # Distinct colorwheels and their output at the last update
+        self._wheels = []
+        self._wheel_rgb = np.zeros((0,3),dtype=float)
+
+        # Per zone: index of its wheel, its brightness, its pixels (a slice,
+        # or None for a whole device) and its output at the last update
+        self._zone_wheel = np.zeros(0,dtype=int)
+        self._zone_brightness = np.zeros(0,dtype=float)
+        self._zone_pixels = []
+        self._zone_values = None
+
+        # Per device: [led, zone indexes, number of pixels (None if the
+        # device shows one color), last values written]
+        self._devices = []
+
+    def add_zone(self,colorwheel,led,brightness=1.0,pixels=None,**kwargs):
+        """
+        Add a zone.
+
+        colorwheel: colorwheel for this zone.  Zones can share a wheel
+                    instance, in which case it is only evaluated once.
+        led: led instance, or the name of a registered driver (see
+             colorchron.led.available()), in which case the keyword arguments
+             are passed to the driver.  Zones on the same device must pass the
+             same instance.
+        brightness: brightness of this zone relative to the clock (between 0
+                    and 1).
+        pixels: None to show the zone on the whole device, or (start,stop) to
+                show it on that range of pixels.  Devices split into pixel
+                ranges must have a 'num_leds' attribute and are sent
+                num_leds x 3 frames; pixels outside every zone stay dark.
+
+        Returns the index of the new zone.
+        """
+
+        try:
+            colorwheel.rgb
+        except AttributeError:
+            err = "colorwheel must have 'rgb' attribute.\n"
+            raise ValueError(err)
+
+        if self._fixed_point and not isinstance(colorwheel,_fixed.FixedPoint):
+            colorwheel = _fixed.FixedPoint(colorwheel)
+
+        if isinstance(led,str):
+            led = _led.create(led,**kwargs)
+        try:
+            led.set
+        except AttributeError:
+            err = "LEDs not available.  Must have 'set' attribute.\n"
+            raise ValueError(err)
+
+        if brightness < 0 or brightness > 1:
+            err = "brightness must be between 0 and 1.\n"
+            raise ValueError(err)
+
+        if pixels is not None:
+            try:
+                start, stop = pixels
+                pixels = slice(int(start),int(stop))
+            except (TypeError,ValueError):
+                err = "pixels must be None or a (start,stop) pair.\n"
+                raise ValueError(err)
+            if pixels.start < 0 or pixels.stop <= pixels.start:
+                err = "pixels must be a non-empty range of pixels.\n"
+                raise ValueError(err)
+
+        # Frames cover the whole device
+        num_pixels = None
+        if pixels is not None:
+            try:
+                num_pixels = int(led.num_leds)
+            except AttributeError:
+                err = "leds split into pixels must have a 'num_leds' attribute.\n"
+                raise ValueError(err)
+            if pixels.stop > num_pixels:
+                err = "pixels ({},{}) do not fit on a device with {} leds.\n".format(pixels.start,
+                                                                                  pixels.stop,
+                                                                                  num_pixels)
+                raise ValueError(err)
+
+        # Find (or add) the device
+        zone = len(self._zone_pixels)
+        for device in self._devices:
+            if device[0] is led:
+                if pixels is None or device[2] is None:
+                    err = "zones can only share a device if they each have pixels.\n"
+                    raise ValueError(err)
+                device[1].append(zone)
+                device[3] = None
+                break
+        else:
+            self._devices.append([led,[zone],num_pixels,None])
+
+        # Find (or add) the colorwheel
+        for i, wheel in enumerate(self._wheels):
+            if wheel is colorwheel:
+                wheel_index = i
+                break
+        else:
+            self._wheels.append(colorwheel)
+            wheel_index = len(self._wheels) - 1
+            self._wheel_rgb = np.zeros((len(self._wheels),3),dtype=float)
+
+        self._zone_wheel = np.append(self._zone_wheel,wheel_index)
+        self._zone_brightness = np.append(self._zone_brightness,float(brightness))
+        self._zone_pixels.append(pixels)
+        self._zone_values = None
+
+        return zone
+
+    def set_zone_brightness(self,zone,brightness):
+        """
+        Change the brightness of a zone (between 0 and 1).  Zone brightness
+        is not shared between processes, so changes made while running only
+        reach a compositor started with runner="thread".
+        """
+
+        if brightness < 0 or brightness > 1:
+            err = "brightness must be between 0 and 1.\n"
+            raise ValueError(err)
+
+        self._zone_brightness[zone] = brightness
+
+    def _zone_bright_scalars(self):
+        """
+        Brightness scalar for each zone: zone brightness times the clock
+        brightness and ambient brightness, limited to between min_brightness
+        and 1.
+        """
+
+        bright = self._zone_brightness*(self._brightness*self._ambient)
+
+        return np.clip(bright,self._min_brightness,1.0)
+
+    def _normalize(self,rgb,bright_scalar):
+        """
+        Normalize an N x 3 array of colorwheel output the same way Clock
+        does, with one brightness scalar per row.
+        """
+
+        if self._output_stage is not None:
+            return self._output_stage.apply_many(scale(rgb,bright_scalar))
+
+        if self._fixed_point:
+            return _fixed.normalize_many(rgb,bright_scalar)
+
+        return normalize(rgb,bright_scalar)
+
+    def _update(self):
+        """
+        Update every zone.
+        """
+
+        metrics = self._metrics
+        start = None
+        if metrics is not None:
+            start = time.perf_counter()
+
+        # Grab any parameter changes made while running
+        self._sync_control()
+
+        # Leave the leds alone while paused
+        if self._paused:
+            return
+
+        # Get the current time in seconds since midnight
+        time_in_seconds = self._seconds_since_midnight()
+        if not self._subsecond:
+            time_in_seconds = int(time_in_seconds)
+        self._time_in_seconds = time_in_seconds
+
+        if len(self._wheels) == 0:
+            return
+
+        # Evaluate each distinct wheel once, then give each zone its wheel's
+        # output
+        wheel_rgb = self._wheel_rgb
+        for i, wheel in enumerate(self._wheels):
+            wheel_rgb[i] = wheel.rgb(time_in_seconds)
+        rgb = wheel_rgb[self._zone_wheel]
+        self._rgb[:] = rgb[0].tolist()
+
+        if metrics is not None:
+            wheel_done = time.perf_counter()
+            metrics.record("colorwheel",wheel_done - start)
+
+        # One sensor read for every zone
+        self._calc_bright_scalar()
+
+        if metrics is not None:
+            sensor_done = time.perf_counter()
+            metrics.record("light_sensor",sensor_done - wheel_done)
+
+        values = self._normalize(rgb,self._zone_bright_scalars())
+        self._zone_values = values
+
+        # One write per device, skipped if the device's values did not change
+        writes = 0
+        for device in self._devices:
+            led, zones, num_pixels, last = device
+
+            if num_pixels is None:
+                out = tuple(values[zones[0]].tolist())
+                changed = out != last
+            else:
+                out = np.zeros((num_pixels,3),dtype=values.dtype)
+                for zone in zones:
+                    out[self._zone_pixels[zone]] = values[zone]
+                changed = last is None or not np.array_equal(out,last)
+
+            if not changed:
+                continue
+
+            device[3] = out
+            led.set(out)
+            writes += 1
+
+        if metrics is not None:
+            end = time.perf_counter()
+            metrics.count("updates")
+            if writes > 0:
+                metrics.count("writes",writes)
+            else:
+                metrics.count("suppressed_writes")
+            metrics.record("led",end - sensor_done)
+            metrics.record("update",end - start)
+
+    def _time_to_next_change(self):
+        """
+        Work out how many seconds from now any zone's output will next change
+        (see Clock._time_to_next_change).
+        """
+
+        if len(self._wheels) == 0 or self._zone_values is None:
+            return self._max_sleep
+
+        if self._output_stage is not None and self._output_stage.dither:
+            return self._update_interval
+
+        for wheel in self._wheels:
+            try:
+                wheel.rgb_many
+            except AttributeError:
+                return self._update_interval
+
+        if self._subsecond:
+            step = self._update_interval
+        else:
+            step = 1
+        horizon = int(math.ceil(self._max_sleep/step))
+        steps = np.arange(1,horizon + 1)*step
+        times = (self._time_in_seconds + steps) % 86400
+
+        # zones x steps x 3
+        rgb = np.stack([wheel.rgb_many(times) for wheel in self._wheels])
+        rgb = rgb[self._zone_wheel]
+        num_zones = len(self._zone_wheel)
+
+        bright = np.repeat(self._zone_bright_scalars(),horizon)
+        values = self._normalize(rgb.reshape(-1,3),bright).reshape(num_zones,horizon,3)
+
+        changed = np.any(values != self._zone_values[:,None,:],axis=(0,2))
+        if not np.any(changed):
+            return self._max_sleep
+
+        next_change = self._time_in_seconds + steps[np.argmax(changed)]
+
+        return self._delay_until(next_change)
+
+    def _shutdown(self):
+        """
+        Blank (or hold) every device once the run loop exits.
+        """
+
+        self._close_control_socket()
+        self._stop_light_sensor()
+
+        if self._on_stop == "hold":
+            return
+
+        for device in self._devices:
+            led, zones, num_pixels, last = device
+            if num_pixels is None:
+                led.set((0,0,0))
+            else:
+                led.set(np.zeros((num_pixels,3),dtype=int))
+            device[3] = None
+
+    def _not_supported(self,*args,**kwargs):
+        err = "Compositor does not support this.  Use add_zone.\n"
+        raise ValueError(err)
+
+    add_colorwheel = _not_supported
+    add_led = _not_supported
+    add_layout = _not_supported
+    add_transition = _not_supported
+    add_recorder = _not_supported
+
+    @property
+    def values(self):
+        """
+        Output of each zone (num_zones x 3) at the last update.
+        """
+
+        return self._zone_values
+
+    @property
+    def zone_values(self):
+        """
+        Output of each zone (num_zones x 3) at the last update.
+        """
+
+        return self._zone_values
+
+    @property
+    def num_zones(self):
+        return len(self._zone_pixels)
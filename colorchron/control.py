@@ -0,0 +1,372 @@
+__description__ = \
+"""
+Local control socket for a running clock.  The clock's run loop serves a
+Unix-domain socket while it sleeps between updates, so commands are handled
+within milliseconds and changes show up without waiting for the next tick.
+This works whichever runner the clock uses (including its own process).
+
+Each request is one line of JSON with a "cmd" key plus arguments; each
+response is one line of JSON with "ok" set to true or false (with "error").
+Commands:
+
+    ping
+    set_brightness        value
+    set_min_brightness    value
+    set_update_interval   value
+    set_wheel             colorwheel (class name), plus colorwheel arguments
+    set_wheel_params      seconds_per_cycle, zero_position, counterclockwise
+    pause
+    resume
+    get_rgb
+    stats
+
+    clock.add_control_socket("/run/colorchron/clock.sock")
+    clock.start()
+
+    from colorchron import control
+    control.request("/run/colorchron/clock.sock","set_brightness",value=0.5)
+
+or from the shell:
+
+    python -m colorchron.control /run/colorchron/clock.sock set_brightness value=0.5
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import os, sys, stat, json, socket, selectors
+
+import numpy as np
+
+from . import colorwheel as _colorwheel
+
+_max_line = 65536
+
+def _to_json(value):
+    """
+    Convert numpy values (and anything else json does not know) for dumps.
+    """
+
+    if isinstance(value,np.ndarray):
+        return value.tolist()
+    if isinstance(value,np.generic):
+        return value.item()
+
+    return str(value)
+
+class ControlServer:
+    """
+    Non-blocking Unix-domain socket server for a clock.  The clock calls
+    serve from its run loop; nothing here runs on its own thread.
+    """
+
+    __slots__ = ("_clock","_path","_selector","_socket","_buffers")
+
+    def __init__(self,clock,path,mode=0o600):
+        """
+        clock: clock to control.
+        path: path of the socket.  A stale socket at this path is replaced.
+        mode: permissions of the socket file.
+        """
+
+        self._clock = clock
+        self._path = path
+
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                err = "{} exists and is not a socket.\n".format(path)
+                raise ValueError(err)
+            os.unlink(path)
+
+        self._socket = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+        self._socket.bind(path)
+        os.chmod(path,mode)
+        self._socket.listen()
+        self._socket.setblocking(False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._socket,selectors.EVENT_READ,None)
+
+        self._buffers = {}
+
+    def serve(self,timeout=0):
+        """
+        Handle requests that arrive within timeout seconds (0 to only handle
+        ones already waiting).  Returns True as soon as a request changes the
+        clock, so the run loop can update right away.
+        """
+
+        changed = False
+        for key, events in self._selector.select(timeout):
+            if key.data is None:
+                self._accept()
+            else:
+                changed = self._receive(key.fileobj) or changed
+
+        return changed
+
+    def _accept(self):
+
+        try:
+            connection, _ = self._socket.accept()
+        except (BlockingIOError,InterruptedError):
+            return
+
+        connection.setblocking(False)
+        self._selector.register(connection,selectors.EVENT_READ,True)
+        self._buffers[connection] = b""
+
+    def _drop(self,connection):
+
+        self._selector.unregister(connection)
+        self._buffers.pop(connection,None)
+        connection.close()
+
+    def _receive(self,connection):
+        """
+        Read from a client and answer each complete line.
+        """
+
+        try:
+            data = connection.recv(4096)
+        except (BlockingIOError,InterruptedError):
+            return False
+        except OSError:
+            data = b""
+
+        if not data:
+            self._drop(connection)
+            return False
+
+        buffer = self._buffers[connection] + data
+        if len(buffer) > _max_line and b"\n" not in buffer:
+            self._drop(connection)
+            return False
+
+        changed = False
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n",1)
+            if not line.strip():
+                continue
+
+            response, did_change = self.handle(line)
+            changed = changed or did_change
+
+            try:
+                connection.sendall(json.dumps(response,default=_to_json).encode("utf-8") + b"\n")
+            except OSError:
+                self._drop(connection)
+                return changed
+
+        self._buffers[connection] = buffer
+
+        return changed
+
+    def handle(self,line):
+        """
+        Run one request (a line of JSON).  Returns the response dictionary and
+        whether the clock was changed.
+        """
+
+        try:
+            request = json.loads(line)
+            command = request.pop("cmd")
+        except (ValueError,TypeError,AttributeError,KeyError):
+            return {"ok":False,"error":"requests must be JSON objects with a 'cmd' key"}, False
+
+        method = getattr(self,"_cmd_{}".format(command),None)
+        if method is None:
+            return {"ok":False,"error":"unknown command '{}'".format(command)}, False
+
+        try:
+            response, changed = method(**request)
+        except (ValueError,TypeError,AttributeError) as e:
+            return {"ok":False,"error":str(e).strip()}, False
+
+        response["ok"] = True
+
+        return response, changed
+
+    def _cmd_ping(self):
+        return {}, False
+
+    def _cmd_set_brightness(self,value):
+        self._clock.brightness = value
+        return {}, True
+
+    def _cmd_set_min_brightness(self,value):
+        self._clock.min_brightness = value
+        return {}, True
+
+    def _cmd_set_update_interval(self,value):
+        self._clock.update_interval = value
+        return {}, True
+
+    def _cmd_set_wheel(self,colorwheel,**kwargs):
+
+        try:
+            cls = getattr(_colorwheel,colorwheel)
+        except (AttributeError,TypeError):
+            err = "colorwheel '{}' not recognized.\n".format(colorwheel)
+            raise ValueError(err)
+
+        # Build the wheel and evaluate it once here, so bad arguments are
+        # reported to the client rather than stopping the run loop
+        try:
+            wheel = cls(**kwargs)
+            wheel.rgb(0)
+            if self._clock._layout is not None:
+                wheel.rgb_many([0])
+        except Exception as e:
+            err = "could not use colorwheel '{}': {}\n".format(colorwheel,e)
+            raise ValueError(err)
+
+        self._clock.add_colorwheel(wheel)
+
+        return {}, True
+
+    def _cmd_set_wheel_params(self,seconds_per_cycle=None,zero_position=None,
+                              counterclockwise=None):
+
+        self._clock.set_wheel_params(seconds_per_cycle=seconds_per_cycle,
+                                     zero_position=zero_position,
+                                     counterclockwise=counterclockwise)
+
+        return {}, True
+
+    def _cmd_pause(self):
+        self._clock.pause()
+        return {}, True
+
+    def _cmd_resume(self):
+        self._clock.resume()
+        return {}, True
+
+    def _cmd_get_rgb(self):
+
+        return {"time":self._clock._time_in_seconds,
+                "rgb":list(self._clock.rgb),
+                "values":self._clock.values}, False
+
+    def _cmd_stats(self):
+
+        clock = self._clock
+
+        return {"paused":clock.paused,
+                "brightness":clock.brightness,
+                "min_brightness":clock.min_brightness,
+                "update_interval":clock.update_interval,
+                "ambient":clock._ambient,
+                "bright_scalar":clock._bright_scalar,
+                "missed_deadlines":clock.missed_deadlines,
+                "metrics":clock.metrics()}, False
+
+    def close(self):
+        """
+        Close every connection and remove the socket file.
+        """
+
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()
+        self._selector.close()
+        self._buffers = {}
+
+        try:
+            os.unlink(self._path)
+        except OSError:
+            pass
+
+    @property
+    def path(self):
+        return self._path
+
+class Client:
+    """
+    Connection to a clock's control socket.
+    """
+
+    __slots__ = ("_socket","_file")
+
+    def __init__(self,path,timeout=1.0):
+        """
+        path: path of the socket.
+        timeout: seconds to wait for the clock to answer.
+        """
+
+        self._socket = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(path)
+        self._file = self._socket.makefile("rb")
+
+    def request(self,command,**kwargs):
+        """
+        Send a command (with its arguments as keywords) and return the
+        response dictionary.  Raises ValueError if the clock reports an
+        error.
+        """
+
+        request = dict(kwargs)
+        request["cmd"] = command
+        self._socket.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        line = self._file.readline()
+        if not line:
+            err = "control socket closed the connection.\n"
+            raise ConnectionError(err)
+
+        response = json.loads(line)
+        if not response.pop("ok",False):
+            err = "{}\n".format(response.get("error","request failed"))
+            raise ValueError(err)
+
+        return response
+
+    def close(self):
+
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*args):
+        self.close()
+
+def request(path,command,timeout=1.0,**kwargs):
+    """
+    Send one command to the clock listening on path and return its response.
+    """
+
+    with Client(path,timeout=timeout) as client:
+        return client.request(command,**kwargs)
+
+def main(argv=None):
+    """
+    Command line interface: path, command, then key=value arguments (values
+    are parsed as JSON where possible).
+    """
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) < 2:
+        sys.stderr.write("usage: python -m colorchron.control path command [key=value ...]\n")
+        sys.exit(2)
+
+    kwargs = {}
+    for arg in argv[2:]:
+        key, _, value = arg.partition("=")
+        try:
+            kwargs[key] = json.loads(value)
+        except ValueError:
+            kwargs[key] = value
+
+    try:
+        response = request(argv[0],argv[1],**kwargs)
+    except (OSError,ValueError) as e:
+        sys.stderr.write("{}\n".format(str(e).strip()))
+        sys.exit(1)
+
+    print(json.dumps(response,indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+__description__ = \
+"""
+Fixed-point integer color engine.  Calculates wheel positions, channel
+ramps, brightness scaling and normalization with integers only, rounding the
+same way every time.  Output is reproducible bit for bit on any machine and
+avoids the +/-1 differences the float path picks up from rounding error.  Use
+it on its own:
+
+    wheel = colorchron.fixed.FixedPoint(colorchron.colorwheel.RGB())
+
+or turn it on for a whole clock with Clock(fixed_point=True).  validate
+compares the integer engine against the float path.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+from .colorwheel import wheels
+
+import numpy as np
+
+# Fractions (brightness, saturation, value, hue) are stored in units of 1/ONE
+SHIFT = 16
+ONE = 1 << SHIFT
+
+def to_fixed(value):
+    """
+    Convert a fraction (e.g. a brightness between 0 and 1) to fixed point.
+    """
+
+    return int(value*ONE + 0.5)
+
+def normalize(rgb,bright_scalar,out=None):
+    """
+    Integer version of the normalization done by Clock._update: scale three
+    channel values so they sum to 255*bright_scalar, rounding halves up.
+    Writes into out (a 3-element list) if given.  Returns the three values.
+    """
+
+    total = rgb[0] + rgb[1] + rgb[2]
+    if total == 0:
+        total = 1
+
+    scale = 2*255*to_fixed(bright_scalar)
+    den = 2*total*ONE
+    half = total*ONE
+
+    if out is None:
+        out = [0,0,0]
+    out[0] = (scale*int(rgb[0]) + half)//den
+    out[1] = (scale*int(rgb[1]) + half)//den
+    out[2] = (scale*int(rgb[2]) + half)//den
+
+    return out
+
+def normalize_many(rgb,bright_scalar):
+    """
+    Vectorized normalize.  Takes an N x 3 integer array of RGB values and
+    returns an N x 3 integer array.  bright_scalar is either a single value or
+    one value per row.
+    """
+
+    rgb = np.asarray(rgb).reshape(-1,3).astype(np.int64)
+
+    total = rgb.sum(axis=1)
+    total[total == 0] = 1
+    total = total[:,None]
+
+    bright = np.floor(np.asarray(bright_scalar,dtype=float)*ONE + 0.5).astype(np.int64)
+    if np.ndim(bright) > 0:
+        bright = bright.reshape(-1,1)
+
+    return (2*255*bright*rgb + total*ONE)//(2*total*ONE)
+
+def _ceil_div(num,den):
+    return -((-num)//den)
+
+class FixedPoint:
+    """
+    Wrap an RGB, CMY, HSV or Chromachron colorwheel so its output is
+    calculated with integers.  Time is counted in whole ticks
+    (ticks_per_second per second); wheel position is the tick count within
+    the cycle.
+    """
+
+    __slots__ = ("_colorwheel",
+                 "_ticks_per_second",
+                 "_kind",
+                 "_cycle",
+                 "_offsets",
+                 "_counterclockwise",
+                 "_saturation",
+                 "_value",
+                 "_values")
+
+    def __init__(self,colorwheel,ticks_per_second=1000):
+        """
+        colorwheel: RGB, CMY, HSV or Chromachron instance.
+        ticks_per_second: resolution of the wheel position.  Times are
+                          rounded to the nearest tick.
+        """
+
+        self._colorwheel = colorwheel
+
+        if isinstance(colorwheel,wheels.RGB):
+            self._kind = "rgb"
+        elif isinstance(colorwheel,wheels.CMY):
+            self._kind = "cmy"
+        elif isinstance(colorwheel,wheels.HSV):
+            self._kind = "hsv"
+        elif isinstance(colorwheel,wheels.Chromachron):
+            self._kind = "chromachron"
+        else:
+            err = "fixed point is only available for RGB, CMY, HSV and Chromachron wheels.\n"
+            raise ValueError(err)
+
+        self._ticks_per_second = int(ticks_per_second)
+        if self._ticks_per_second < 1:
+            err = "ticks_per_second must be at least 1.\n"
+            raise ValueError(err)
+
+        self._setup()
+
+    def _setup(self):
+        """
+        Convert the wheel parameters to integers.
+        """
+
+        wheel = self._colorwheel
+
+        self._cycle = int(round(wheel._seconds_per_cycle*self._ticks_per_second))
+        if self._cycle < 1:
+            err = "seconds_per_cycle must be at least one tick.\n"
+            raise ValueError(err)
+
+        # Offset of each channel around the wheel, in ticks
+        zero = (wheel._zero_position % 360)/360
+        self._offsets = [int(round((zero + i/3)*self._cycle)) % self._cycle
+                         for i in range(3)]
+        self._counterclockwise = wheel._counterclockwise
+
+        if self._kind == "hsv":
+            self._saturation = to_fixed(wheel._saturation)
+            self._value = to_fixed(wheel._value)
+        if self._kind == "chromachron":
+            self._values = [list(v) for v in wheel._values]
+
+    def configure(self,**kwargs):
+        """
+        Change the parameters of the wrapped wheel (see its configure method).
+        """
+
+        self._colorwheel.configure(**kwargs)
+        self._setup()
+
+    def _ticks(self,time):
+        return int(round(time*self._ticks_per_second))
+
+    def _position(self,ticks,channel):
+        """
+        Position of a channel around the wheel, from 0 to cycle ticks.
+        """
+
+        position = (ticks + self._offsets[channel]) % self._cycle
+        if self._counterclockwise:
+            position = self._cycle - position
+
+        return position
+
+    def _ramps(self,ticks,out):
+        """
+        Write the level of each channel into out: 255 times the ramp value,
+        rounded up for RGB or down for CMY (which shows 255 minus it).  The
+        ramp goes up over the first sixth of the wheel, holds for two sixths,
+        goes down over one sixth, then is off.
+        """
+
+        cycle = self._cycle
+        offsets = self._offsets
+        counterclockwise = self._counterclockwise
+        cmy = self._kind == "cmy"
+
+        for i in range(3):
+
+            position = (ticks + offsets[i]) % cycle
+            if counterclockwise:
+                position = cycle - position
+
+            six = 6*position
+            if six < cycle:
+                level = 255*six
+            elif six < 3*cycle:
+                level = 255*cycle
+            elif six < 4*cycle:
+                level = 255*(4*cycle - six)
+            else:
+                level = 0
+
+            if cmy:
+                out[i] = 255 - level//cycle
+            else:
+                out[i] = -((-level)//cycle)
+
+        return out
+
+    def _hsv(self,position):
+        """
+        colorsys.hsv_to_rgb in integers.  Returns the three channels times
+        255*ONE**3.
+        """
+
+        # Hue and its fractional part within the sextant, in units of 1/ONE
+        hue = (position << SHIFT)//self._cycle
+        sextant = (6*hue) >> SHIFT
+        f = 6*hue - (sextant << SHIFT)
+
+        s = self._saturation
+        v = self._value*255
+
+        p = v*(ONE - s)*ONE
+        q = v*(ONE*ONE - s*f)
+        t = v*(ONE*ONE - s*(ONE - f))
+        v = v*ONE*ONE
+
+        sextant = sextant % 6
+        if sextant == 0:
+            return v, t, p
+        if sextant == 1:
+            return q, v, p
+        if sextant == 2:
+            return p, v, t
+        if sextant == 3:
+            return p, q, v
+        if sextant == 4:
+            return t, p, v
+        return v, p, q
+
+    def rgb(self,time,out=None):
+
+        ticks = self._ticks(time)
+
+        if out is None:
+            out = [0,0,0]
+
+        kind = self._kind
+        if kind == "rgb" or kind == "cmy":
+            self._ramps(ticks,out)
+        elif kind == "hsv":
+            values = self._hsv(self._position(ticks,0))
+            den = ONE*ONE*ONE
+            for i in range(3):
+                out[i] = _ceil_div(values[i],den)
+        else:
+            index = (len(self._values)*self._position(ticks,0))//self._cycle
+            values = self._values[min(index,len(self._values) - 1)]
+            out[0] = values[0]
+            out[1] = values[1]
+            out[2] = values[2]
+
+        return out
+
+    def rgb_many(self,times):
+
+        times = np.asarray(times,dtype=float).reshape(-1)
+        ticks = np.rint(times*self._ticks_per_second).astype(np.int64)
+
+        cycle = self._cycle
+        offsets = np.array(self._offsets,dtype=np.int64)
+        position = (ticks[:,None] + offsets[None,:]) % cycle
+        if self._counterclockwise:
+            position = cycle - position
+
+        kind = self._kind
+        if kind in ("rgb","cmy"):
+            six = 6*position
+            ramp = np.select([six < cycle,six < 3*cycle,six < 4*cycle],
+                             [255*six,255*cycle,255*(4*cycle - six)],
+                             0)
+            if kind == "rgb":
+                return _ceil_div(ramp,cycle).astype(np.uint8)
+            return (255 - ramp//cycle).astype(np.uint8)
+
+        position = position[:,0]
+
+        if kind == "chromachron":
+            index = (len(self._values)*position)//cycle
+            index = np.minimum(index,len(self._values) - 1)
+            return np.array(self._values,dtype=np.uint8)[index]
+
+        hue = (position << SHIFT)//cycle
+        sextant = (6*hue) >> SHIFT
+        f = 6*hue - (sextant << SHIFT)
+
+        s = self._saturation
+        v = self._value*255
+
+        p = np.full(len(hue),v*(ONE - s)*ONE,dtype=np.int64)
+        q = v*(ONE*ONE - s*f)
+        t = v*(ONE*ONE - s*(ONE - f))
+        v = np.full(len(hue),v*ONE*ONE,dtype=np.int64)
+
+        sextant = sextant % 6
+        values = np.stack((np.choose(sextant,[v,q,p,p,t,v]),
+                           np.choose(sextant,[t,v,v,q,p,p]),
+                           np.choose(sextant,[p,p,t,v,v,q])),axis=1)
+
+        return _ceil_div(values,ONE*ONE*ONE).astype(np.uint8)
+
+def validate(colorwheel,times=None,bright_scalars=(1.0,0.5,0.1,0.05),
+             ticks_per_second=1000):
+    """
+    Compare the fixed point engine against the float path for colorwheel.
+
+    colorwheel: RGB, CMY, HSV or Chromachron instance.
+    times: times to compare.  If None, every whole second of one cycle.
+    bright_scalars: brightness scalars at which to compare normalized output.
+    ticks_per_second: passed to FixedPoint.
+
+    Returns a dictionary with the number of samples compared, the number of
+    colorwheel values that differ and the largest difference
+    (wheel_differences, wheel_max_diff), the same for the normalized led
+    values over all bright_scalars (output_differences, output_max_diff), and
+    the number of times the fixed point rgb and rgb_many methods disagree
+    (scalar_mismatches, which should always be 0).
+    """
+
+    from .colorchron import normalize as float_normalize
+
+    if times is None:
+        times = np.arange(int(colorwheel._seconds_per_cycle))
+    times = np.asarray(times).reshape(-1)
+
+    fixed = FixedPoint(colorwheel,ticks_per_second=ticks_per_second)
+
+    float_rgb = colorwheel.rgb_many(times).astype(int)
+    fixed_rgb = fixed.rgb_many(times).astype(int)
+    wheel_diff = np.abs(float_rgb - fixed_rgb)
+
+    output_differences = 0
+    output_max_diff = 0
+    for bright_scalar in bright_scalars:
+        diff = np.abs(float_normalize(float_rgb,bright_scalar) -
+                      normalize_many(fixed_rgb,bright_scalar))
+        output_differences += int(np.sum(diff != 0))
+        output_max_diff = max(output_max_diff,int(diff.max()))
+
+    # Check a spread of times through the scalar path too
+    sample = times[::max(1,len(times)//1000)]
+    scalar_mismatches = 0
+    for t, expected in zip(sample,fixed.rgb_many(sample)):
+        if fixed.rgb(t) != expected.tolist():
+            scalar_mismatches += 1
+
+    return {"samples":len(times),
+            "wheel_differences":int(np.sum(wheel_diff != 0)),
+            "wheel_max_diff":int(wheel_diff.max()),
+            "output_differences":output_differences,
+            "output_max_diff":output_max_diff,
+            "scalar_mismatches":scalar_mismatches}
@@ -1,3 +1,25 @@
 from .base import LED
-from .gpio import GPIO
-from .neopixel import Neopixel
+from .fake import FakeLED, FakeGPIO
+
+from ..registry import Registry
+
+# Hardware drivers are only imported when they are first used
+_registry = Registry("colorchron.led",
+                     {"gpio":"colorchron.led.gpio:GPIO",
+                      "neopixel":"colorchron.led.neopixel:Neopixel",
+                      "fake":"colorchron.led.fake:FakeLED"})
+
+register = _registry.register
+load = _registry.load
+create = _registry.create
+available = _registry.available
+
+_lazy = {"GPIO":"gpio",
+         "Neopixel":"neopixel"}
+
+def __getattr__(name):
+
+    if name in _lazy:
+        return _registry.load(_lazy[name])
+
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__,name))
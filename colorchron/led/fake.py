@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+__description__ = \
+"""
+In-memory led array and GPIO module for running the clock without hardware.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+from .base import LED
+
+import collections
+
+class FakeLED(LED):
+    """
+    Led array that records what it was sent rather than lighting anything.
+    """
+
+    def __init__(self,num_leds=1,history=0):
+        """
+        num_leds: number of leds in the array
+        history: number of past values to keep (0 keeps none)
+        """
+
+        self._num_leds = num_leds
+        if self._num_leds <= 0:
+            err = "number of leds must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._value = None
+        self._num_writes = 0
+        self._history = collections.deque(maxlen=history)
+
+    def set(self,rgb):
+
+        self._value = rgb
+        self._num_writes += 1
+        if self._history.maxlen:
+            self._history.append(rgb)
+
+    @property
+    def num_leds(self):
+        """
+        Number of leds in the array.
+        """
+
+        return self._num_leds
+
+    @property
+    def value(self):
+        """
+        Last value sent to the leds (None if nothing has been sent).
+        """
+
+        return self._value
+
+    @property
+    def num_writes(self):
+        """
+        Number of times set has been called.
+        """
+
+        return self._num_writes
+
+    @property
+    def history(self):
+        """
+        List of the most recent values sent to the leds, oldest first.
+        """
+
+        return list(self._history)
+
+
+class FakePWM:
+    """
+    Stand-in for an RPi.GPIO PWM channel.
+    """
+
+    def __init__(self,pin,frequency):
+
+        self.pin = pin
+        self.frequency = frequency
+        self.duty = None
+        self.running = False
+        self.num_changes = 0
+
+    def start(self,duty):
+
+        self.duty = duty
+        self.running = True
+
+    def ChangeDutyCycle(self,duty):
+
+        if duty < 0 or duty > 100:
+            err = "duty cycle must be between 0 and 100.\n"
+            raise ValueError(err)
+
+        self.duty = duty
+        self.num_changes += 1
+
+    def ChangeFrequency(self,frequency):
+
+        self.frequency = frequency
+
+    def stop(self):
+
+        self.running = False
+
+class FakeGPIO:
+    """
+    Stand-in for the RPi.GPIO module, for running the GPIO driver off a Pi.
+    PWM channels that have been created are kept in pwm, keyed by pin.
+    """
+
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+
+    def __init__(self):
+
+        self.mode = None
+        self.pins = {}
+        self.pwm = {}
+
+    def setmode(self,mode):
+        self.mode = mode
+
+    def setup(self,pin,direction):
+        self.pins[pin] = direction
+
+    def PWM(self,pin,frequency):
+
+        if pin not in self.pins:
+            err = "pin {} has not been set up.\n".format(pin)
+            raise ValueError(err)
+
+        self.pwm[pin] = FakePWM(pin,frequency)
+
+        return self.pwm[pin]
+
+    def cleanup(self,pins=None):
+
+        if pins is None:
+            pins = list(self.pins)
+        for pin in pins:
+            self.pins.pop(pin,None)
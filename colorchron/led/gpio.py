@@ -8,30 +8,113 @@ __date__ = "2018-11-12"
 
 from .base import LED
 
-from RPi import GPIO
-GPIO.setmode(GPIO.BCM)
-
 class GPIO(LED):
+    """
+    Red, green and blue leds driven by software PWM on three GPIO pins.  A
+    channel's duty cycle is only sent to the PWM when it changes.  Values can
+    be fractional (e.g. from an OutputStage with high_resolution=True), giving
+    finer steps than 8 bits.
+    """
 
-    def __init__(self,pin_numbers):
+    def __init__(self,pin_numbers,frequency=50,gpio=None):
+        """
+        pin_numbers: three GPIO pins (BCM numbering) for red, green and blue.
+        frequency: PWM frequency in Hz.
+        gpio: module with the RPi.GPIO interface.  If None, import RPi.GPIO.
+              Pass colorchron.led.fake.FakeGPIO() to run without hardware.
+        """
 
         self._pin_numbers = pin_numbers[:]
         if len(self._pin_numbers) != 3:
             err = "GPIO LEDs require three GPIO pins.\n"
             raise ValueError(err)
 
-        # Configure GPIO pins
+        self._frequency = frequency
+        if self._frequency <= 0:
+            err = "PWM frequency must be greater than zero.\n"
+            raise ValueError(err)
+
+        # Only touch the GPIO library once a driver is actually created
+        if gpio is None:
+            from RPi import GPIO as gpio
+        self._gpio = gpio
+        self._gpio.setmode(self._gpio.BCM)
+
+        # Configure GPIO pins, starting dark
         self._pins = []
         for pin in self._pin_numbers:
-            GPIO.setup(pin,GPIO.OUT)
-            self._pins.append(GPIO.PWM(pin,50))
-            self._pins[-1].start(50)
+            self._gpio.setup(pin,self._gpio.OUT)
+            self._pins.append(self._gpio.PWM(pin,self._frequency))
+            self._pins[-1].start(0)
 
+        # Duty cycle last sent to each channel
+        self._duty = [0.0,0.0,0.0]
+        self._num_changes = 0
 
     def set(self,rgb):
+        """
+        Set the three channels.  Values are clipped to between 0 and 255.
+        """
+
+        if not self._pins:
+            err = "GPIO LEDs have been closed.\n"
+            raise RuntimeError(err)
 
+        duty = self._duty
         for i in range(3):
 
-            freq = 100*value/255
-            self._pins[i].ChangeDutyCycle(freq)
+            value = 100*min(max(rgb[i],0),255)/255
+            if value == duty[i]:
+                continue
+
+            self._pins[i].ChangeDutyCycle(value)
+            duty[i] = value
+            self._num_changes += 1
+
+    def close(self):
+        """
+        Stop the PWM and release the pins.  The leds cannot be set afterwards.
+        """
+
+        if not self._pins:
+            return
+
+        for pin in self._pins:
+            pin.stop()
+        self._pins = []
+        self._gpio.cleanup(self._pin_numbers)
+
+    @property
+    def frequency(self):
+        """
+        PWM frequency in Hz.
+        """
+
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self,frequency):
+
+        if frequency <= 0:
+            err = "PWM frequency must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._frequency = frequency
+        for pin in self._pins:
+            pin.ChangeFrequency(frequency)
+
+    @property
+    def duty(self):
+        """
+        Duty cycle (0-100) of each channel.
+        """
+
+        return self._duty[:]
+
+    @property
+    def num_changes(self):
+        """
+        Number of duty cycle changes sent to the PWM.
+        """
 
+        return self._num_changes
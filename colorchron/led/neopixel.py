@@ -8,13 +8,21 @@ __date__ = "2018-11-12"
 
 from .base import LED
 
-import board, neopixel
+import numpy as np
 
 class Neopixel(LED):
+    """
+    Neopixel led array.  Keeps its own copy of the frame, writes whole frames
+    to the strip in one bulk update, and only pushes data out to the strip
+    when the frame actually changed.
+    """
 
-    def __init__(self,num_leds=15):
+    def __init__(self,num_leds=15,pixels=None):
         """
         num_leds: number of leds in the array
+        pixels: object to write frames to.  If None, create a
+                neopixel.NeoPixel on pin D18.  Any object with the same
+                interface (slice assignment, fill and show) can be used.
         """
 
         self._num_leds = num_leds
@@ -22,9 +30,62 @@ class Neopixel(LED):
             err = "number of leds must be greater than zero.\n"
             raise ValueError(err)
 
-        self._neopixels = neopixel.NeoPixel(board.D18, self._num_leds)
+        if pixels is None:
+            import board, neopixel
+            pixels = neopixel.NeoPixel(board.D18,
+                                       self._num_leds,
+                                       auto_write=False)
+        self._neopixels = pixels
+
+        # Frame currently on the strip (not valid until the first write)
+        self._buffer = np.zeros((self._num_leds,3),dtype=np.uint8)
+        self._written = False
 
     def set(self,rgb):
-        for i in range(self._num_leds):
-            self._neopixels[i] = tuple(rgb)
-        
+        """
+        Set the strip.  rgb is either a single 3-element rgb value (applied to
+        every led) or a num_leds x 3 array with one value per led.  Values
+        should be between 0 and 255.
+        """
+
+        frame = np.asarray(rgb)
+        uniform = frame.ndim == 1
+        if uniform:
+            if frame.shape != (3,):
+                err = "rgb must have three values.\n"
+                raise ValueError(err)
+        elif frame.shape != (self._num_leds,3):
+            err = "frame must be a num_leds x 3 array.\n"
+            raise ValueError(err)
+
+        frame = np.clip(np.rint(frame),0,255).astype(np.uint8)
+
+        # Nothing to do if the strip already shows this frame
+        if self._written and np.all(self._buffer == frame):
+            return
+
+        self._buffer[:] = frame
+        self._written = True
+
+        if uniform:
+            self._neopixels.fill(tuple(frame.tolist()))
+        else:
+            self._neopixels[0:self._num_leds] = [tuple(p) for p in self._buffer.tolist()]
+
+        self._neopixels.show()
+
+    @property
+    def num_leds(self):
+        """
+        Number of leds in the array.
+        """
+
+        return self._num_leds
+
+    @property
+    def frame(self):
+        """
+        Copy of the frame currently on the strip (num_leds x 3 uint8 array).
+        """
+
+        return self._buffer.copy()
@@ -1,2 +1,25 @@
 from .base import AmbientLightSensor
-from .cjmcu3216 import CJMCU3216
+from .fake import FakeLightSensor
+from .sampler import Sampler, EMAFilter, MedianFilter, HysteresisFilter
+from .i2c import BusManager, FakeBus
+
+from ..registry import Registry
+
+# Hardware drivers are only imported when they are first used
+_registry = Registry("colorchron.light_sensor",
+                     {"cjmcu3216":"colorchron.light_sensor.cjmcu3216:CJMCU3216",
+                      "fake":"colorchron.light_sensor.fake:FakeLightSensor"})
+
+register = _registry.register
+load = _registry.load
+create = _registry.create
+available = _registry.available
+
+_lazy = {"CJMCU3216":"cjmcu3216"}
+
+def __getattr__(name):
+
+    if name in _lazy:
+        return _registry.load(_lazy[name])
+
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__,name))
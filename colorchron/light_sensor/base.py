@@ -12,6 +12,13 @@ class AmbientLightSensor:
     AmbientLightSensor and redefine _initialize_hardware and _read_brightness.
     """
 
+    __slots__ = ("_min_out",
+                 "_max_out",
+                 "_min_meas",
+                 "_max_meas",
+                 "_slope",
+                 "_intercept")
+
     def __init__(self,
                  min_out=0.05,max_out=1.0,
                  min_meas=0,max_meas=65792):
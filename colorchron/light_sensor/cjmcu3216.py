@@ -5,29 +5,55 @@ Driver for a CJMCU 3216 ambient light sensor.
 __author__ = "Michael J. Harms"
 __date__ = "2018-11-12"
 
-import smbus
-
 from .base import AmbientLightSensor
+from . import i2c
 
 class CJMCU3216(AmbientLightSensor):
     """
     Read an ambient light sensor and return a value between min_out and
     max_out.  Implemented for a CJMCU-3216 sensor plugged into I2C bus.
     """
-    
+
+    __slots__ = ("_sensor_bus",
+                 "_sensor_address",
+                 "_low_address",
+                 "_manager",
+                 "_bus")
+
+    def __init__(self,
+                 min_out=0.05,max_out=1.0,
+                 min_meas=0,max_meas=65792,
+                 bus=1,address=0x1E,manager=None):
+        """
+        bus: I2C bus number the sensor is on.
+        address: I2C address of the sensor.
+        manager: colorchron.light_sensor.i2c.BusManager that owns the bus
+                 handles.  If None, use the shared default manager, so every
+                 sensor on a bus uses the same handle.
+
+        See AmbientLightSensor for the other arguments.
+        """
+
+        self._sensor_bus = bus
+        self._sensor_address = address
+
+        if manager is None:
+            manager = i2c.default_manager()
+        self._manager = manager
+        self._bus = None
+
+        super().__init__(min_out,max_out,min_meas,max_meas)
+
     def _initialize_hardware(self):
         """
         Initialize hardware (CJMCU 3216 values).
         """
 
-        self._sensor_bus = 1
-        self._sensor_address = 0x1E
         self._low_address = 0x0C 
-        self._high_address = 0x0D
 
         # Activate device
-        self._bus = smbus.SMBus(self._sensor_bus)
-        self._bus.write_byte_data(self._sensor_address,0x00,0x01)
+        self._bus = self._manager.acquire(self._sensor_bus)
+        self._bus.write_byte(self._sensor_address,0x00,0x01)
 
     def _read_brightness(self):
         """
@@ -35,10 +61,19 @@ class CJMCU3216(AmbientLightSensor):
         """  
         
         # Combine readings from low-sensitivity and high-sensitivity sensors
-        # to get full 16-bit range 
-        low =  self._bus.read_byte_data(self._sensor_address,self._low_address)
-        high = self._bus.read_byte_data(self._sensor_address,self._high_address)
+        # to get full 16-bit range.  Both bytes come from one block read so
+        # they are always from the same measurement.
+        low, high = self._bus.read_block(self._sensor_address,
+                                         self._low_address,2)
         value = (high << 8) + low
 
         return value
 
+    def close(self):
+        """
+        Hand the bus back to the manager.
+        """
+
+        if self._bus is not None:
+            self._manager.release(self._sensor_bus)
+            self._bus = None
@@ -0,0 +1,59 @@
+__description__ = \
+"""
+In-memory ambient light sensor for running the clock without hardware.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+from .base import AmbientLightSensor
+
+class FakeLightSensor(AmbientLightSensor):
+    """
+    Ambient light sensor whose raw measurement is set from python.  Set the
+    measurement attribute directly, or pass a sequence of readings that are
+    returned in turn (holding the last one once it runs out).
+    """
+
+    __slots__ = ("measurement","_readings","_num_reads")
+
+    def __init__(self,
+                 min_out=0.05,max_out=1.0,
+                 min_meas=0,max_meas=65792,
+                 measurement=None,readings=None):
+        """
+        measurement: raw measurement to report.  If None, report max_meas.
+        readings: optional sequence of raw measurements to report, one per
+                  read.
+
+        See AmbientLightSensor for the other arguments.
+        """
+
+        self.measurement = measurement
+        if readings is None:
+            readings = []
+        self._readings = iter(readings)
+        self._num_reads = 0
+
+        super().__init__(min_out,max_out,min_meas,max_meas)
+
+        if self.measurement is None:
+            self.measurement = self._max_meas
+
+    def _read_brightness(self):
+
+        self._num_reads += 1
+
+        try:
+            self.measurement = next(self._readings)
+        except StopIteration:
+            pass
+
+        return self.measurement
+
+    @property
+    def num_reads(self):
+        """
+        Number of times the sensor has been read.
+        """
+
+        return self._num_reads
@@ -0,0 +1,212 @@
+__description__ = \
+"""
+Shared access to I2C buses.  A BusManager opens each bus once, however many
+sensors use it, and serializes transactions on a bus between threads.
+Sensors ask the manager for a bus with acquire and hand it back with release;
+the handle is closed when the last user releases it.  FakeBus stands in for
+smbus.SMBus when there is no hardware.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import os, threading
+
+def _open_smbus(bus):
+    """
+    Open a hardware bus.  smbus is only imported when a bus is first opened.
+    """
+
+    import smbus
+    return smbus.SMBus(bus)
+
+class SharedBus:
+    """
+    One open bus, shared by every sensor on it.  Each method is a single
+    transaction and holds the bus lock while it runs.
+    """
+
+    __slots__ = ("_number","_handle","_lock","_users")
+
+    def __init__(self,number,handle):
+
+        self._number = number
+        self._handle = handle
+        self._lock = threading.Lock()
+        self._users = 0
+
+    def read_byte(self,address,register):
+        with self._lock:
+            return self._handle.read_byte_data(address,register)
+
+    def write_byte(self,address,register,value):
+        with self._lock:
+            self._handle.write_byte_data(address,register,value)
+
+    def read_block(self,address,register,length):
+        """
+        Read length consecutive registers, starting at register, in one
+        transaction.  Returns a list of bytes.
+        """
+
+        with self._lock:
+            return self._handle.read_i2c_block_data(address,register,length)
+
+    @property
+    def number(self):
+        return self._number
+
+    @property
+    def handle(self):
+        return self._handle
+
+class BusManager:
+    """
+    Pool of open I2C buses, one handle per bus number.
+    """
+
+    __slots__ = ("_opener","_buses","_lock","_pid")
+
+    def __init__(self,opener=None):
+        """
+        opener: function taking a bus number and returning an smbus-like
+                handle (read_byte_data, write_byte_data, read_i2c_block_data
+                and close).  If None, open smbus.SMBus.  Pass
+                lambda n: FakeBus() to run without hardware.
+        """
+
+        if opener is None:
+            opener = _open_smbus
+        self._opener = opener
+
+        self._buses = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def acquire(self,bus):
+        """
+        Return the SharedBus for bus number bus, opening it if needed.
+        """
+
+        with self._lock:
+
+            # Handles opened before a fork are not shared with the child
+            if os.getpid() != self._pid:
+                self._buses = {}
+                self._pid = os.getpid()
+
+            shared = self._buses.get(bus)
+            if shared is None:
+                shared = SharedBus(bus,self._opener(bus))
+                self._buses[bus] = shared
+            shared._users += 1
+
+            return shared
+
+    def release(self,bus):
+        """
+        Give back a bus from acquire.  The handle is closed once every user
+        has released it.
+        """
+
+        with self._lock:
+
+            shared = self._buses.get(bus)
+            if shared is None:
+                return
+
+            shared._users -= 1
+            if shared._users > 0:
+                return
+
+            del self._buses[bus]
+            try:
+                shared.handle.close()
+            except AttributeError:
+                pass
+
+    @property
+    def buses(self):
+        """
+        Numbers of the buses currently open.
+        """
+
+        return sorted(self._buses)
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+def default_manager():
+    """
+    BusManager shared by every sensor that is not given its own.
+    """
+
+    global _default_manager
+
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = BusManager()
+
+    return _default_manager
+
+class FakeBus:
+    """
+    In-memory stand-in for smbus.SMBus.  Registers are kept per device
+    address; unset registers read as 0.
+    """
+
+    __slots__ = ("_registers","_num_transactions","_closed")
+
+    def __init__(self,registers=None):
+        """
+        registers: optional dictionary mapping (address,register) to a byte.
+        """
+
+        self._registers = {}
+        if registers is not None:
+            self._registers.update(registers)
+
+        self._num_transactions = 0
+        self._closed = False
+
+    def set_word(self,address,register,value):
+        """
+        Store a 16-bit value little-endian across register and register + 1.
+        """
+
+        self._registers[(address,register)] = value & 0xFF
+        self._registers[(address,register + 1)] = (value >> 8) & 0xFF
+
+    def read_byte_data(self,address,register):
+
+        self._num_transactions += 1
+        return self._registers.get((address,register),0)
+
+    def write_byte_data(self,address,register,value):
+
+        self._num_transactions += 1
+        self._registers[(address,register)] = value
+
+    def read_i2c_block_data(self,address,register,length):
+
+        self._num_transactions += 1
+        return [self._registers.get((address,register + i),0)
+                for i in range(length)]
+
+    def close(self):
+        self._closed = True
+
+    @property
+    def registers(self):
+        return self._registers
+
+    @property
+    def num_transactions(self):
+        """
+        Number of reads and writes made on the bus.
+        """
+
+        return self._num_transactions
+
+    @property
+    def closed(self):
+        return self._closed
@@ -0,0 +1,247 @@
+__description__ = \
+"""
+Read an ambient light sensor on a background thread, filtering the readings
+and caching the latest value so the clock never waits on the hardware.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import os, threading, collections
+
+class EMAFilter:
+    """
+    Exponential moving average.  alpha is the weight given to each new
+    reading (between 0 and 1; smaller is smoother).
+    """
+
+    def __init__(self,alpha=0.2):
+
+        self._alpha = alpha
+        if self._alpha <= 0 or self._alpha > 1:
+            err = "alpha must be greater than 0 and less than or equal to 1.\n"
+            raise ValueError(err)
+
+        self._value = None
+
+    def __call__(self,value):
+
+        if self._value is None:
+            self._value = value
+        else:
+            self._value += self._alpha*(value - self._value)
+
+        return self._value
+
+class MedianFilter:
+    """
+    Median of the last window readings.  Removes isolated spikes.
+    """
+
+    def __init__(self,window=5):
+
+        self._window = int(window)
+        if self._window < 1:
+            err = "window must be at least 1.\n"
+            raise ValueError(err)
+
+        self._values = collections.deque(maxlen=self._window)
+
+    def __call__(self,value):
+
+        self._values.append(value)
+        ordered = sorted(self._values)
+
+        n = len(ordered)
+        if n % 2 == 1:
+            return ordered[n//2]
+
+        return (ordered[n//2 - 1] + ordered[n//2])/2
+
+class HysteresisFilter:
+    """
+    Hold the output until a reading differs from it by more than band.  Stops
+    the output from hunting back and forth around a threshold.
+    """
+
+    def __init__(self,band=0.02):
+
+        self._band = band
+        if self._band < 0:
+            err = "band must not be negative.\n"
+            raise ValueError(err)
+
+        self._value = None
+
+    def __call__(self,value):
+
+        if self._value is None or abs(value - self._value) > self._band:
+            self._value = value
+
+        return self._value
+
+_filters = {"ema":EMAFilter,
+            "median":MedianFilter,
+            "hysteresis":HysteresisFilter}
+
+def _make_filter(f):
+    """
+    Turn a filter name or callable into a callable.
+    """
+
+    if callable(f):
+        return f
+
+    try:
+        return _filters[f]()
+    except (KeyError,TypeError):
+        err = "filter '{}' not recognized.  Should be a callable or one of:\n".format(f)
+        err += "    {}\n".format(", ".join(_filters))
+        raise ValueError(err)
+
+class Sampler:
+    """
+    Wrap an ambient light sensor so it is read on its own schedule by a
+    background thread.  The brightness attribute returns the latest filtered
+    value without touching the hardware, so a Sampler can be passed to
+    Clock.add_ambient_light_sensor in place of the sensor itself:
+
+        sensor = colorchron.light_sensor.CJMCU3216()
+        clock.add_ambient_light_sensor(colorchron.light_sensor.Sampler(sensor))
+
+    The clock calls start when its run loop starts, so the thread runs in the
+    process that runs the clock.  Until the first successful reading,
+    brightness returns default.
+    """
+
+    __slots__ = ("_light_sensor",
+                 "_rate",
+                 "_filters",
+                 "_value",
+                 "_num_samples",
+                 "_num_errors",
+                 "_pid",
+                 "_thread",
+                 "_stop_event")
+
+    def __init__(self,light_sensor,rate=1.0,filters=("median","ema"),
+                 default=1.0):
+        """
+        light_sensor: sensor to read.  Must have a 'brightness' attribute.
+        rate:         number of readings per second.
+        filters:      filters applied, in order, to each reading.  Each entry
+                      is either 'ema', 'median', 'hysteresis' or a callable
+                      that takes a reading and returns a filtered value (for
+                      example, EMAFilter(alpha=0.5)).  Can be a single entry.
+        default:      brightness returned before the first successful reading
+                      (1.0, the same as a clock without a sensor).
+        """
+
+        self._light_sensor = light_sensor
+        try:
+            self._light_sensor.brightness
+        except AttributeError:
+            err = "Light sensor not readable.  Must have 'brightness' attribute.\n"
+            raise ValueError(err)
+
+        self._rate = rate
+        if self._rate <= 0:
+            err = "rate must be greater than zero.\n"
+            raise ValueError(err)
+
+        if filters is None:
+            filters = ()
+        elif isinstance(filters,str) or callable(filters):
+            filters = (filters,)
+        self._filters = [_make_filter(f) for f in filters]
+
+        self._value = default
+        self._num_samples = 0
+        self._num_errors = 0
+
+        self._pid = None
+        self._thread = None
+        self._stop_event = None
+
+    def _sample(self):
+        """
+        Take one reading and run it through the filters.  If the read fails,
+        keep the previous value.
+        """
+
+        try:
+            value = self._light_sensor.brightness
+        except (OSError,IOError):
+            self._num_errors += 1
+            return
+
+        for f in self._filters:
+            value = f(value)
+
+        self._value = value
+        self._num_samples += 1
+
+    def _loop(self,stop_event):
+        """
+        Take readings every 1/rate seconds until stop_event is set.
+        """
+
+        while not stop_event.wait(1/self._rate):
+            self._sample()
+
+    def start(self):
+        """
+        Take a first reading and start the background thread in this
+        process.
+        """
+
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+
+        self._sample()
+
+        self._pid = os.getpid()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._loop,
+                                        args=(self._stop_event,),
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread.
+        """
+
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        if self._pid == os.getpid():
+            self._thread.join()
+
+        self._thread = None
+        self._pid = None
+
+    @property
+    def brightness(self):
+        """
+        Latest filtered brightness (default until a reading succeeds).  Does
+        not block on the hardware.
+        """
+
+        return self._value
+
+    @property
+    def num_samples(self):
+        """
+        Number of successful readings taken in this process.
+        """
+
+        return self._num_samples
+
+    @property
+    def num_errors(self):
+        """
+        Number of readings that failed in this process.
+        """
+
+        return self._num_errors
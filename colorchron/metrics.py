@@ -0,0 +1,193 @@
+__description__ = \
+"""
+Low-overhead counters and latency histograms for the clock update loop.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import os, bisect, tempfile
+
+class Histogram:
+    """
+    Histogram of durations (in seconds) with fixed, logarithmically spaced
+    buckets.  Recording a value is a binary search and an increment, so it is
+    cheap enough to do on every update.
+    """
+
+    def __init__(self,smallest=1e-6,largest=10.0,factor=2.0):
+        """
+        smallest: upper edge of the first bucket, in seconds.
+        largest: values above this land in a final overflow bucket.
+        factor: ratio between successive bucket edges.
+        """
+
+        if smallest <= 0 or largest <= smallest or factor <= 1:
+            err = "need 0 < smallest < largest and factor > 1.\n"
+            raise ValueError(err)
+
+        self._edges = [smallest]
+        while self._edges[-1] < largest:
+            self._edges.append(self._edges[-1]*factor)
+
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all recorded values.
+        """
+
+        self._counts = [0 for _ in range(len(self._edges) + 1)]
+        self._count = 0
+        self._total = 0.0
+        self._min = None
+        self._max = None
+
+    def record(self,value):
+        """
+        Record one value.
+        """
+
+        self._counts[bisect.bisect_left(self._edges,value)] += 1
+        self._count += 1
+        self._total += value
+
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def percentile(self,q):
+        """
+        Estimate of the q-th percentile (0-100).  Returns the upper edge of the
+        bucket containing it (the largest value seen for the overflow bucket),
+        or None if nothing has been recorded.
+        """
+
+        if self._count == 0:
+            return None
+
+        target = q/100*self._count
+        seen = 0
+        for i, c in enumerate(self._counts):
+            seen += c
+            if seen >= target and c > 0:
+                if i < len(self._edges):
+                    return min(self._edges[i],self._max)
+                return self._max
+
+        return self._max
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def mean(self):
+        if self._count == 0:
+            return None
+        return self._total/self._count
+
+    def as_dict(self):
+        """
+        Summary of the histogram as a dictionary.
+        """
+
+        return {"count":self._count,
+                "mean":self.mean,
+                "min":self._min,
+                "max":self._max,
+                "p50":self.percentile(50),
+                "p90":self.percentile(90),
+                "p99":self.percentile(99),
+                "edges":list(self._edges),
+                "counts":list(self._counts)}
+
+class Metrics:
+    """
+    Counters and per-stage timing histograms for a clock.
+    """
+
+    stages = ("colorwheel","light_sensor","led","update")
+    counters = ("updates","writes","suppressed_writes","missed_deadlines")
+
+    def __init__(self):
+
+        self._timings = dict([(s,Histogram()) for s in self.stages])
+        self._lateness = Histogram()
+        self._counts = dict([(c,0) for c in self.counters])
+
+    def reset(self):
+        """
+        Clear all counters and histograms.
+        """
+
+        for h in self._timings.values():
+            h.reset()
+        self._lateness.reset()
+        for c in self._counts:
+            self._counts[c] = 0
+
+    def record(self,stage,seconds):
+        """
+        Record the time taken by one stage of an update.
+        """
+
+        self._timings[stage].record(seconds)
+
+    def record_lateness(self,seconds):
+        """
+        Record how late (in seconds) an update started relative to its
+        scheduled time.
+        """
+
+        self._lateness.record(seconds)
+
+    def count(self,counter,n=1):
+        """
+        Increment a counter.
+        """
+
+        self._counts[counter] += n
+
+    def snapshot(self):
+        """
+        Dictionary holding the current counters and histogram summaries.
+        """
+
+        out = dict(self._counts)
+        out["timings"] = dict([(s,h.as_dict()) for s, h in self._timings.items()])
+        out["lateness"] = self._lateness.as_dict()
+
+        return out
+
+    def to_text(self):
+        """
+        Current metrics as "name value" lines (times in seconds).
+        """
+
+        lines = []
+        for c in self.counters:
+            lines.append("{} {}".format(c,self._counts[c]))
+
+        summaries = [("timing_{}".format(s),h) for s, h in self._timings.items()]
+        summaries.append(("lateness",self._lateness))
+        for name, h in summaries:
+            for key in ["count","mean","min","max","p50","p90","p99"]:
+                value = h.as_dict()[key]
+                if value is None:
+                    value = "nan"
+                lines.append("{}_{} {}".format(name,key,value))
+
+        return "\n".join(lines) + "\n"
+
+    def write(self,filename):
+        """
+        Write to_text() to filename, replacing it atomically so readers never
+        see a partial file.
+        """
+
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_file = tempfile.mkstemp(dir=directory,suffix=".tmp")
+        with os.fdopen(fd,"w") as f:
+            f.write(self.to_text())
+        os.replace(tmp_file,filename)
@@ -0,0 +1,146 @@
+__description__ = \
+"""
+Output stage applied between brightness normalization and the leds.  Maps
+linear channel levels through a precomputed gamma table and, optionally,
+uses temporal dithering (or fractional output for drivers that can use it)
+so dim colors do not collapse onto a handful of 8-bit levels.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import numpy as np
+
+class OutputStage:
+    """
+    Table-driven gamma correction with optional temporal dithering.  Input
+    levels are floats between 0 and 255 (the normalized channel values before
+    rounding).  Each update costs one table lookup per channel.
+    """
+
+    __slots__ = ("_gamma",
+                 "_levels",
+                 "_dither",
+                 "_high_resolution",
+                 "_scale",
+                 "_table_int",
+                 "_table_fixed",
+                 "_table_float",
+                 "_array_int",
+                 "_array_fixed",
+                 "_array_float",
+                 "_error",
+                 "_error_many")
+
+    def __init__(self,gamma=2.2,levels=4096,dither=False,high_resolution=False):
+        """
+        gamma: exponent applied to the level (1.0 means no correction).
+        levels: number of input steps in the lookup table.
+        dither: spread the fractional part of each output over successive
+                updates (True or False).  Averaged over time, the leds then
+                show levels between the 8-bit steps.
+        high_resolution: output floats (0-255) rather than integers, for led
+                         drivers with finer control than 8 bits (e.g. the GPIO
+                         PWM driver).  Overrides dither.
+        """
+
+        self._gamma = gamma
+        if self._gamma <= 0:
+            err = "gamma must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._levels = int(levels)
+        if self._levels < 256:
+            err = "levels must be at least 256.\n"
+            raise ValueError(err)
+
+        self._dither = bool(dither)
+        self._high_resolution = bool(high_resolution)
+
+        # Input level x (0-255) maps to table index int(x*scale + 0.5)
+        self._scale = (self._levels - 1)/255
+
+        x = np.linspace(0,1,self._levels)
+        y = 255*x**self._gamma
+
+        # Tables as arrays (for frames) and plain python lists (fastest for
+        # a single color)
+        self._array_float = y
+        self._array_int = np.round(y).astype(int)
+        self._array_fixed = np.round(y*256).astype(int)
+
+        self._table_float = self._array_float.tolist()
+        self._table_int = self._array_int.tolist()
+        self._table_fixed = self._array_fixed.tolist()
+
+        self._error = [0,0,0]
+        self._error_many = None
+
+    @property
+    def dither(self):
+        return self._dither and not self._high_resolution
+
+    @property
+    def high_resolution(self):
+        return self._high_resolution
+
+    def apply(self,levels,out):
+        """
+        Map three levels (0-255) to output values, writing them into out (a
+        3-element list).  Returns out.
+        """
+
+        scale = self._scale
+        if self._high_resolution:
+            table = self._table_float
+            for i in range(3):
+                out[i] = table[int(levels[i]*scale + 0.5)]
+            return out
+
+        if not self._dither:
+            table = self._table_int
+            for i in range(3):
+                out[i] = table[int(levels[i]*scale + 0.5)]
+            return out
+
+        # Output values are kept in 1/256 steps.  Whatever is lost when
+        # rounding down to an integer is carried into the next update.
+        table = self._table_fixed
+        error = self._error
+        for i in range(3):
+            value = table[int(levels[i]*scale + 0.5)] + error[i]
+            whole = value >> 8
+            error[i] = value - (whole << 8)
+            out[i] = whole
+
+        return out
+
+    def lookup_many(self,levels):
+        """
+        Map an N x 3 array of levels to output values without dithering.
+        """
+
+        index = (np.asarray(levels,dtype=float)*self._scale + 0.5).astype(int)
+        if self._high_resolution:
+            return self._array_float[index]
+
+        return self._array_int[index]
+
+    def apply_many(self,levels):
+        """
+        Map an N x 3 array of levels (one row per led) to output values,
+        dithering each led separately if requested.
+        """
+
+        if not self.dither:
+            return self.lookup_many(levels)
+
+        index = (np.asarray(levels,dtype=float)*self._scale + 0.5).astype(int)
+
+        if self._error_many is None or self._error_many.shape != index.shape:
+            self._error_many = np.zeros(index.shape,dtype=int)
+
+        value = self._array_fixed[index] + self._error_many
+        whole = value >> 8
+        self._error_many = value - (whole << 8)
+
+        return whole
@@ -0,0 +1,245 @@
+__description__ = \
+"""
+Record what the clock does on every update (time, colorwheel output, ambient
+brightness and the values sent to the leds) to a fixed-size, memory-mapped
+ring buffer on disk.  Each update is packed straight into the map with a
+single struct.pack_into, so recording can be left on in the field.  Once the buffer is full the oldest
+records are overwritten.  Use read to decode a recording and replay to play it
+back through an led driver (by default colorchron.led.FakeLED).
+
+    recorder = colorchron.recorder.Recorder("/var/tmp/colorchron.rec")
+    clock.add_recorder(recorder)
+    ...
+    records = colorchron.recorder.read("/var/tmp/colorchron.rec")
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import os, time, struct
+
+import numpy as np
+
+_magic = b"CCHRREC1"
+_version = 1
+_header_size = 64
+
+_header_dtype = np.dtype([("magic","S8"),
+                          ("version","<u4"),
+                          ("num_leds","<u4"),
+                          ("capacity","<u8"),
+                          ("count","<u8")])
+_count_offset = _header_dtype.fields["count"][1]
+_count_struct = struct.Struct("<Q")
+
+def record_dtype(num_leds=1):
+    """
+    Layout of a single record for a clock driving num_leds leds.  rgb and
+    out hold one row per led.
+    """
+
+    return np.dtype([("wall_time","<f8"),
+                     ("clock_time","<f8"),
+                     ("ambient","<f4"),
+                     ("bright_scalar","<f4"),
+                     ("written","u1"),
+                     ("rgb","<f4",(num_leds,3)),
+                     ("out","<f4",(num_leds,3))])
+
+def _read_header(filename):
+    """
+    Read and check the header of a recording.
+    """
+
+    header = np.fromfile(filename,dtype=_header_dtype,count=1)
+    if len(header) != 1 or header["magic"][0] != _magic:
+        err = "{} is not a colorchron recording.\n".format(filename)
+        raise ValueError(err)
+
+    if header["version"][0] != _version:
+        err = "recording version {} not supported.\n".format(header["version"][0])
+        raise ValueError(err)
+
+    return header[0]
+
+class Recorder:
+    """
+    Memory-mapped ring buffer of clock updates.
+    """
+
+    __slots__ = ("_filename",
+                 "_num_leds",
+                 "_capacity",
+                 "_map",
+                 "_header",
+                 "_records",
+                 "_count",
+                 "_record_size",
+                 "_fields",
+                 "_single",
+                 "_rgb",
+                 "_out")
+
+    def __init__(self,filename,capacity=86400,num_leds=1):
+        """
+        filename: file holding the ring buffer.  If it already holds a
+                  recording with the same capacity and num_leds, new records
+                  are appended to it.
+        capacity: number of updates kept.
+        num_leds: number of leds per update (must match the clock's layout,
+                  or be 1 if the clock shows a single color).
+        """
+
+        self._filename = filename
+        self._capacity = int(capacity)
+        self._num_leds = int(num_leds)
+
+        if self._capacity < 1 or self._num_leds < 1:
+            err = "capacity and num_leds must be at least 1.\n"
+            raise ValueError(err)
+
+        dtype = record_dtype(self._num_leds)
+        size = _header_size + self._capacity*dtype.itemsize
+
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            header = _read_header(filename)
+            if header["capacity"] != self._capacity or \
+               header["num_leds"] != self._num_leds:
+                err = "{} was recorded with capacity {} and num_leds {}.\n".format(filename,
+                                                                                    header["capacity"],
+                                                                                    header["num_leds"])
+                raise ValueError(err)
+        else:
+            with open(filename,"wb") as f:
+                f.truncate(size)
+
+        self._map = np.memmap(filename,dtype=np.uint8,mode="r+",shape=(size,))
+        self._header = self._map[:_header_size].view(_header_dtype)
+        self._records = self._map[_header_size:].view(dtype)
+
+        if self._header["magic"][0] != _magic:
+            self._header["magic"][0] = _magic
+            self._header["version"][0] = _version
+            self._header["num_leds"][0] = self._num_leds
+            self._header["capacity"][0] = self._capacity
+            self._header["count"][0] = 0
+
+        self._count = int(self._header["count"][0])
+
+        # Packers matching record_dtype: the scalar fields, and (for one led)
+        # the whole record
+        self._record_size = dtype.itemsize
+        self._fields = struct.Struct("<ddffB")
+        self._single = struct.Struct("<ddffB3f3f")
+        self._rgb = self._records["rgb"]
+        self._out = self._records["out"]
+
+    def append(self,clock_time,rgb,ambient,bright_scalar,out,written):
+        """
+        Record one update.
+
+        clock_time: time shown by the clock (seconds since midnight).
+        rgb: colorwheel output (3 values, or num_leds x 3).
+        ambient: ambient brightness.
+        bright_scalar: brightness scalar applied to the output.
+        out: values for the leds (3 values, or num_leds x 3).
+        written: whether out was sent to the leds.
+        """
+
+        i = self._count % self._capacity
+        offset = _header_size + i*self._record_size
+
+        if self._num_leds == 1:
+            self._single.pack_into(self._map,offset,
+                                   time.time(),clock_time,ambient,
+                                   bright_scalar,written,
+                                   rgb[0],rgb[1],rgb[2],
+                                   out[0],out[1],out[2])
+        else:
+            self._fields.pack_into(self._map,offset,
+                                   time.time(),clock_time,ambient,
+                                   bright_scalar,written)
+            self._rgb[i] = rgb
+            self._out[i] = out
+
+        # Only count the record once it is complete
+        self._count += 1
+        _count_struct.pack_into(self._map,_count_offset,self._count)
+
+    def flush(self):
+        """
+        Write any pending changes to disk.
+        """
+
+        self._map.flush()
+
+    def __len__(self):
+        return min(self._count,self._capacity)
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def num_leds(self):
+        return self._num_leds
+
+    @property
+    def count(self):
+        """
+        Total number of updates recorded (including overwritten ones).
+        """
+        return self._count
+
+def read(filename):
+    """
+    Read a recording.  Returns a structured numpy array of records (see
+    record_dtype), oldest first.
+    """
+
+    header = _read_header(filename)
+    capacity = int(header["capacity"])
+    count = int(header["count"])
+
+    records = np.memmap(filename,dtype=record_dtype(int(header["num_leds"])),
+                        mode="r",offset=_header_size,shape=(capacity,))
+
+    if count <= capacity:
+        return np.array(records[:count])
+
+    i = count % capacity
+
+    return np.concatenate((records[i:],records[:i]))
+
+def replay(filename,led=None,written_only=True):
+    """
+    Send the recorded led values to led, in order.  If led is None, a
+    colorchron.led.FakeLED keeping the full history is used.  If written_only
+    is True, only updates that were sent to the leds are replayed.  Returns
+    the led.
+    """
+
+    records = read(filename)
+    if written_only:
+        records = records[records["written"] == 1]
+
+    num_leds = records.dtype["out"].shape[0]
+    if led is None:
+        from .led import FakeLED
+        led = FakeLED(num_leds=num_leds,history=len(records))
+
+    for out in records["out"]:
+
+        # Whole numbers go back to the integers the clock sent
+        if np.array_equal(out,np.round(out)):
+            out = out.astype(int)
+
+        if num_leds == 1:
+            led.set(tuple(out[0].tolist()))
+        else:
+            led.set(out)
+
+    return led
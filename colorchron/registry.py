@@ -0,0 +1,116 @@
+__description__ = \
+"""
+Registry mapping backend names (e.g. "neopixel") to driver classes.  Drivers
+are only imported when they are first asked for, so importing colorchron does
+not require the libraries for hardware that is not being used.  Third-party
+drivers can be added with register or through a package entry point.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import importlib
+
+try:
+    from importlib import metadata as _metadata
+except ImportError:
+    _metadata = None
+
+def _entry_points(group):
+    """
+    Entry points advertised for group by installed packages.
+    """
+
+    if _metadata is None:
+        return []
+
+    try:
+        eps = _metadata.entry_points()
+    except Exception:
+        return []
+
+    try:
+        return list(eps.select(group=group))
+    except AttributeError:
+        return list(eps.get(group,[]))
+
+class Registry:
+    """
+    Lazily loaded collection of drivers.  Each driver is registered under a
+    name as either a class or an import path of the form "module:attribute".
+    Import paths are only resolved the first time the driver is loaded.
+    """
+
+    def __init__(self,group,builtins=None):
+        """
+        group: entry point group searched for drivers not registered directly
+               (e.g. "colorchron.led").
+        builtins: dictionary mapping names to classes or import paths.
+        """
+
+        self._group = group
+        self._targets = {}
+        self._loaded = {}
+
+        if builtins is not None:
+            for name, target in builtins.items():
+                self.register(name,target)
+
+    def register(self,name,target):
+        """
+        Register a driver.
+
+        name: name used to refer to the driver.
+        target: driver class, or a "module:attribute" string pointing to it.
+        """
+
+        name = name.lower()
+        self._targets[name] = target
+        self._loaded.pop(name,None)
+
+    def load(self,name):
+        """
+        Return the driver class registered under name, importing it if
+        necessary.
+        """
+
+        key = name.lower()
+        if key in self._loaded:
+            return self._loaded[key]
+
+        if key not in self._targets:
+            for ep in _entry_points(self._group):
+                if ep.name.lower() == key:
+                    self._loaded[key] = ep.load()
+                    return self._loaded[key]
+
+            err = "driver '{}' not recognized.  Available drivers are:\n".format(name)
+            err += "    {}\n".format(", ".join(self.available()))
+            raise ValueError(err)
+
+        target = self._targets[key]
+        if isinstance(target,str):
+            module_name, attr = target.split(":")
+            target = getattr(importlib.import_module(module_name),attr)
+
+        self._loaded[key] = target
+
+        return target
+
+    def create(self,name,*args,**kwargs):
+        """
+        Load the driver registered under name and create an instance of it.
+        """
+
+        return self.load(name)(*args,**kwargs)
+
+    def available(self):
+        """
+        Sorted list of driver names (registered directly or through entry
+        points).  Listing a driver does not import it.
+        """
+
+        names = set(self._targets)
+        for ep in _entry_points(self._group):
+            names.add(ep.name.lower())
+
+        return sorted(names)
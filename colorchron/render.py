@@ -0,0 +1,335 @@
+__description__ = \
+"""
+Render the color timeline of one or more colorwheel configurations to disk
+without any hardware.  Output is written in chunks as it is calculated, so
+long spans at fine resolution never have to fit in memory, and chunks are
+calculated in parallel by a pool of worker processes.
+
+    colorchron-render --colorwheel RYB --counterclockwise --output ryb.png
+    colorchron-render day.json night.json --step 0.5 --format csv --output out/
+
+A configuration file is a JSON dictionary.  "colorwheel" names the wheel class;
+"brightness", "min_brightness" and "ambient" set the brightness normalization
+(as applied by Clock); "lut" wraps the wheel in a LookupTable; "normalize"
+(default true) can be set false to write the raw wheel output.  Any other keys
+are passed to the colorwheel (e.g. seconds_per_cycle, zero_position).
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import os, sys, json, zlib, struct, argparse, multiprocessing
+
+import numpy as np
+
+from . import colorwheel as _colorwheel
+from .colorchron import normalize, calc_bright_scalar
+
+_clock_keys = ("colorwheel","brightness","min_brightness","ambient","lut","normalize","name")
+
+# Wheels already built in this (worker) process, keyed by configuration
+_wheels = {}
+
+def _build_wheel(config):
+    """
+    Create (or reuse) the colorwheel described by config.
+    """
+
+    key = json.dumps(config,sort_keys=True)
+    if key in _wheels:
+        return _wheels[key]
+
+    name = config.get("colorwheel","RGB")
+    try:
+        cls = getattr(_colorwheel,name)
+    except AttributeError:
+        err = "colorwheel '{}' not recognized.\n".format(name)
+        raise ValueError(err)
+
+    kwargs = dict([(k,v) for k, v in config.items() if k not in _clock_keys])
+    wheel = cls(**kwargs)
+
+    if config.get("lut",False):
+        wheel = _colorwheel.LookupTable(wheel)
+
+    _wheels[key] = wheel
+
+    return wheel
+
+def render_chunk(config,start,step,first,num):
+    """
+    Render num samples of a configuration, starting at sample first.  Sample
+    i is at time start + i*step seconds (wrapped at midnight, as Clock sees
+    it).  Returns a num x 3 uint8 array.
+    """
+
+    wheel = _build_wheel(config)
+
+    times = start + step*(first + np.arange(num))
+    times = np.mod(times,86400)
+
+    rgb = wheel.rgb_many(times)
+    if not config.get("normalize",True):
+        return np.asarray(rgb,dtype=np.uint8)
+
+    bright_scalar = calc_bright_scalar(config.get("brightness",1.0),
+                                       config.get("ambient",1.0),
+                                       config.get("min_brightness",0.05))
+
+    values = normalize(rgb,bright_scalar)
+
+    return np.clip(values,0,255).astype(np.uint8)
+
+def _render_chunk(args):
+    return render_chunk(*args)
+
+class CSVWriter:
+    """
+    Write samples as "time,r,g,b" lines.
+    """
+
+    def __init__(self,filename,num_samples,start,step,width):
+
+        self._f = open(filename,"w")
+        self._f.write("time,r,g,b\n")
+        self._start = start
+        self._step = step
+        self._written = 0
+
+    def write(self,rgb):
+
+        times = self._start + self._step*(self._written + np.arange(len(rgb)))
+        data = np.column_stack((times,rgb))
+        np.savetxt(self._f,data,fmt=["%.6f","%d","%d","%d"],delimiter=",")
+        self._written += len(rgb)
+
+    def close(self):
+        self._f.close()
+
+class NPYWriter:
+    """
+    Write samples to a num_samples x 3 uint8 .npy file.
+    """
+
+    def __init__(self,filename,num_samples,start,step,width):
+
+        self._array = np.lib.format.open_memmap(filename,mode="w+",
+                                                dtype=np.uint8,
+                                                shape=(num_samples,3))
+        self._written = 0
+
+    def write(self,rgb):
+
+        self._array[self._written:self._written + len(rgb)] = rgb
+        self._written += len(rgb)
+
+    def close(self):
+
+        self._array.flush()
+        del self._array
+
+class PNGWriter:
+    """
+    Write samples as a PNG strip width pixels wide, with time running down the
+    image (one row per sample).  Rows are compressed and written as they
+    arrive.
+    """
+
+    def __init__(self,filename,num_samples,start,step,width):
+
+        self._f = open(filename,"wb")
+        self._width = width
+        self._compressor = zlib.compressobj()
+
+        self._f.write(b"\x89PNG\r\n\x1a\n")
+        header = struct.pack(">IIBBBBB",width,num_samples,8,2,0,0,0)
+        self._chunk(b"IHDR",header)
+
+    def _chunk(self,kind,data):
+
+        self._f.write(struct.pack(">I",len(data)))
+        self._f.write(kind)
+        self._f.write(data)
+        self._f.write(struct.pack(">I",zlib.crc32(kind + data) & 0xffffffff))
+
+    def write(self,rgb):
+
+        # Each row is a filter byte (0) followed by width copies of the color
+        rows = np.zeros((len(rgb),1 + 3*self._width),dtype=np.uint8)
+        rows[:,1:] = np.tile(rgb,(1,self._width))
+
+        data = self._compressor.compress(rows.tobytes())
+        if data:
+            self._chunk(b"IDAT",data)
+
+    def close(self):
+
+        data = self._compressor.flush()
+        if data:
+            self._chunk(b"IDAT",data)
+        self._chunk(b"IEND",b"")
+        self._f.close()
+
+_writers = {"csv":CSVWriter,
+            "npy":NPYWriter,
+            "png":PNGWriter}
+
+def render(config,
+           filename,
+           start=0.0,
+           span=86400.0,
+           step=1.0,
+           file_format=None,
+           chunk_size=65536,
+           pool=None,
+           width=64):
+    """
+    Render a configuration to filename.
+
+    config: configuration dictionary (see module description).
+    filename: file to write.
+    start: time of the first sample, in seconds since midnight.
+    span: seconds to render.
+    step: seconds between samples (can be less than one).
+    file_format: 'csv', 'npy' or 'png'.  If None, use the extension of
+                 filename.
+    chunk_size: number of samples calculated (and written) at a time.
+    pool: multiprocessing pool used to calculate chunks.  If None, calculate
+          them in this process.
+    width: width of png output in pixels.
+
+    Returns the number of samples written.
+    """
+
+    if step <= 0 or span <= 0:
+        err = "step and span must be greater than zero.\n"
+        raise ValueError(err)
+
+    if file_format is None:
+        file_format = os.path.splitext(filename)[1][1:].lower()
+    if file_format not in _writers:
+        err = "format '{}' not recognized.  Should be one of:\n".format(file_format)
+        err += "    {}\n".format(", ".join(_writers))
+        raise ValueError(err)
+
+    num_samples = int(round(span/step))
+    chunks = [(config,start,step,first,min(chunk_size,num_samples - first))
+              for first in range(0,num_samples,chunk_size)]
+
+    # Build the wheel once here so configuration errors show up before any
+    # work is farmed out
+    _build_wheel(config)
+
+    writer = _writers[file_format](filename,num_samples,start,step,width)
+    try:
+        if pool is None:
+            results = map(_render_chunk,chunks)
+        else:
+            results = pool.imap(_render_chunk,chunks)
+        for rgb in results:
+            writer.write(rgb)
+    finally:
+        writer.close()
+
+    return num_samples
+
+def main(argv=None):
+    """
+    Command line interface.
+    """
+
+    parser = argparse.ArgumentParser(prog="colorchron-render",
+                                     description="Render colorwheel timelines to disk.")
+    parser.add_argument("configs",nargs="*",
+                        help="JSON configuration files.  If none are given, the configuration comes from the options below.")
+    parser.add_argument("--colorwheel",default="RGB")
+    parser.add_argument("--seconds-per-cycle",type=float,default=None)
+    parser.add_argument("--zero-position",type=float,default=None)
+    parser.add_argument("--counterclockwise",action="store_true",default=None)
+    parser.add_argument("--brightness",type=float,default=1.0)
+    parser.add_argument("--min-brightness",type=float,default=0.05)
+    parser.add_argument("--ambient",type=float,default=1.0)
+    parser.add_argument("--raw",action="store_true",
+                        help="write the raw colorwheel output (no brightness normalization)")
+    parser.add_argument("--start",type=float,default=0.0,
+                        help="time of first sample (seconds since midnight)")
+    parser.add_argument("--span",type=float,default=86400.0,
+                        help="seconds to render")
+    parser.add_argument("--step",type=float,default=1.0,
+                        help="seconds between samples")
+    parser.add_argument("--format",default=None,choices=list(_writers),
+                        help="output format (default: from output extension)")
+    parser.add_argument("--output",default=None,
+                        help="output file (one configuration) or directory (several)")
+    parser.add_argument("--chunk-size",type=int,default=65536)
+    parser.add_argument("--workers",type=int,default=None,
+                        help="worker processes (default: one per cpu; 1 for none)")
+    parser.add_argument("--width",type=int,default=64,
+                        help="width of png output in pixels")
+    args = parser.parse_args(argv)
+
+    # Load configurations
+    configs = []
+    if len(args.configs) == 0:
+        config = {"colorwheel":args.colorwheel,
+                  "brightness":args.brightness,
+                  "min_brightness":args.min_brightness,
+                  "ambient":args.ambient,
+                  "normalize":not args.raw}
+        if args.seconds_per_cycle is not None:
+            config["seconds_per_cycle"] = args.seconds_per_cycle
+        if args.zero_position is not None:
+            config["zero_position"] = args.zero_position
+        if args.counterclockwise is not None:
+            config["counterclockwise"] = args.counterclockwise
+        configs.append((args.colorwheel,config))
+    else:
+        for filename in args.configs:
+            with open(filename) as f:
+                config = json.load(f)
+            name = os.path.splitext(os.path.basename(filename))[0]
+            configs.append((config.get("name",name),config))
+
+    file_format = args.format
+    if file_format is None and args.output is not None and len(configs) == 1:
+        file_format = os.path.splitext(args.output)[1][1:].lower() or None
+    if file_format is None:
+        file_format = "png"
+
+    # Work out output files
+    if len(configs) == 1 and args.output is not None and not os.path.isdir(args.output):
+        outputs = [args.output]
+    else:
+        out_dir = args.output
+        if out_dir is None:
+            out_dir = "."
+        os.makedirs(out_dir,exist_ok=True)
+        outputs = [os.path.join(out_dir,"{}.{}".format(name,file_format))
+                   for name, _ in configs]
+
+    workers = args.workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    pool = None
+    if workers > 1:
+        pool = multiprocessing.Pool(workers)
+
+    try:
+        for (name, config), output in zip(configs,outputs):
+            num = render(config,
+                         output,
+                         start=args.start,
+                         span=args.span,
+                         step=args.step,
+                         file_format=file_format,
+                         chunk_size=args.chunk_size,
+                         pool=pool,
+                         width=args.width)
+            sys.stderr.write("wrote {} samples of '{}' to {}\n".format(num,name,output))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+if __name__ == "__main__":
+    main()
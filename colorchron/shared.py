@@ -0,0 +1,103 @@
+__description__ = \
+"""
+Block of shared memory holding clock parameters that can be changed while the
+clock is running.  The clock loop (which may be in another process) checks the
+block once per update and applies any changes, so nothing needs to be
+restarted.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import math, multiprocessing
+
+class ControlBlock:
+    """
+    Named floating point parameters in shared memory plus a generation counter
+    that is incremented on every change.  Readers compare the generation to
+    the last one they saw to cheaply decide whether anything changed.  Unset
+    parameters are stored as NaN and read back as None.
+    """
+
+    fields = ("brightness",
+              "min_brightness",
+              "update_interval",
+              "seconds_per_cycle",
+              "zero_position",
+              "counterclockwise",
+              "paused")
+
+    def __init__(self,**values):
+        """
+        values: initial value of any of the fields.
+        """
+
+        self._index = dict([(f,i) for i, f in enumerate(self.fields)])
+        self._generation_index = len(self.fields)
+
+        self._array = multiprocessing.Array("d",len(self.fields) + 1)
+        for i in range(len(self.fields)):
+            self._array[i] = math.nan
+
+        self.set(**values)
+
+    def _check_field(self,field):
+
+        if field not in self._index:
+            err = "'{}' is not a control field.  Should be one of:\n".format(field)
+            err += "    {}\n".format(", ".join(self.fields))
+            raise ValueError(err)
+
+    def set(self,**values):
+        """
+        Set one or more fields and bump the generation.  A value of None
+        clears the field.
+        """
+
+        for field in values:
+            self._check_field(field)
+
+        with self._array.get_lock():
+            for field, value in values.items():
+                if value is None:
+                    value = math.nan
+                self._array[self._index[field]] = float(value)
+            self._array[self._generation_index] += 1
+
+    def get(self,field):
+        """
+        Current value of a field (None if not set).
+        """
+
+        self._check_field(field)
+
+        value = self._array[self._index[field]]
+        if math.isnan(value):
+            return None
+
+        return value
+
+    def read(self):
+        """
+        Consistent snapshot of the block.  Returns a (generation, values) tuple
+        where values is a dictionary keyed by field.
+        """
+
+        with self._array.get_lock():
+            raw = self._array[:]
+
+        values = {}
+        for field, i in self._index.items():
+            if math.isnan(raw[i]):
+                values[field] = None
+            else:
+                values[field] = raw[i]
+
+        return int(raw[self._generation_index]), values
+
+    @property
+    def generation(self):
+        """
+        Counter incremented every time the block changes.
+        """
+
+        return int(self._array[self._generation_index])
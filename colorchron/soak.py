@@ -0,0 +1,216 @@
+__description__ = \
+"""
+Headless soak test for clock configurations.  Drives a Clock with in-memory
+led and light sensor backends through days of simulated time and reports the
+CPU time used per simulated hour, memory allocations, and any abrupt jumps in
+the output.
+
+From the command line:
+
+    python3 -m colorchron.soak --colorwheel RYB --days 2
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import time, tracemalloc, argparse, json, sys, inspect
+
+from .colorchron import Clock
+from .timesource import VirtualTime
+from .led.fake import FakeLED
+from .light_sensor.fake import FakeLightSensor
+from . import colorwheel as _colorwheel
+
+class _WatchedLED(FakeLED):
+    """
+    Fake led that watches for large jumps between consecutive outputs.
+    """
+
+    def __init__(self,time_source,max_jump):
+
+        super().__init__()
+
+        self._time_source = time_source
+        self._max_jump = max_jump
+        self._largest_jump = 0
+        self.discontinuities = []
+
+    def set(self,rgb):
+
+        previous = self._value
+        super().set(rgb)
+
+        if previous is None:
+            return
+
+        jump = max([abs(int(a) - int(b)) for a, b in zip(rgb,previous)])
+        if jump > self._largest_jump:
+            self._largest_jump = jump
+
+        if jump > self._max_jump:
+            self.discontinuities.append({"elapsed":self._time_source.monotonic(),
+                                         "from":[int(v) for v in previous],
+                                         "to":[int(v) for v in rgb],
+                                         "jump":jump})
+
+    @property
+    def largest_jump(self):
+        return self._largest_jump
+
+class _ProfileLightSensor(FakeLightSensor):
+    """
+    Fake light sensor whose raw measurement is a function of the simulated
+    time of day.
+    """
+
+    __slots__ = ("_time_source","_profile")
+
+    def __init__(self,time_source,profile):
+
+        self._time_source = time_source
+        self._profile = profile
+
+        super().__init__()
+
+    def _read_brightness(self):
+
+        self._num_reads += 1
+
+        return self._profile(self._time_source.seconds_since_midnight())
+
+def soak(colorwheel,
+         days=1.0,
+         start=0.0,
+         ambient_profile=None,
+         max_jump=16,
+         track_allocations=True,
+         **clock_kwargs):
+    """
+    Run a clock through simulated time as fast as possible.
+
+    colorwheel: colorwheel instance to test.
+    days: number of simulated days to run.
+    start: simulated time of day (seconds since midnight) at which to start.
+    ambient_profile: function taking seconds since midnight and returning a
+                     raw light sensor measurement (0-65792).  If None, no light
+                     sensor is used.
+    max_jump: a change of more than this in any output channel between
+              consecutive writes is reported as a discontinuity.
+    track_allocations: measure memory allocations with tracemalloc (slows
+                       the run down).
+    clock_kwargs: passed to Clock (e.g. update_interval, event_driven).
+
+    Returns a dictionary summarizing the run.
+    """
+
+    if days <= 0:
+        err = "days must be greater than zero.\n"
+        raise ValueError(err)
+
+    # The clock is run an hour at a time, so keep the leds lit in between
+    clock_kwargs.setdefault("on_stop","hold")
+
+    time_source = VirtualTime(start=start)
+    clock = Clock(time_source=time_source,metrics=True,**clock_kwargs)
+
+    led = _WatchedLED(time_source,max_jump)
+    clock.add_colorwheel(colorwheel)
+    clock.add_led(led)
+    if ambient_profile is not None:
+        clock.add_ambient_light_sensor(_ProfileLightSensor(time_source,
+                                                           ambient_profile))
+
+    if track_allocations:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    # Run one simulated hour at a time, recording CPU used for each
+    cpu_per_hour = []
+    num_hours = int(round(days*24))
+    for i in range(num_hours):
+
+        # Measure allocations after the first hour, once everything is warm
+        if track_allocations and i == 1:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+        cpu_start = time.process_time()
+        clock.run(3600)
+        cpu_per_hour.append(time.process_time() - cpu_start)
+
+    allocations = None
+    if track_allocations:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if num_hours > 1:
+            allocations = {"steady_state_growth":current - baseline,
+                           "steady_state_peak":peak - baseline}
+        else:
+            allocations = {"steady_state_growth":None,
+                           "steady_state_peak":None}
+
+    metrics = clock.metrics()
+
+    return {"simulated_hours":num_hours,
+            "cpu_per_hour":cpu_per_hour,
+            "mean_cpu_per_hour":sum(cpu_per_hour)/len(cpu_per_hour),
+            "max_cpu_per_hour":max(cpu_per_hour),
+            "updates":metrics["updates"],
+            "writes":metrics["writes"],
+            "suppressed_writes":metrics["suppressed_writes"],
+            "allocations":allocations,
+            "largest_jump":led.largest_jump,
+            "discontinuities":led.discontinuities}
+
+def _needs_arguments(cls):
+    """
+    Whether cls can only be created with arguments the command line does not
+    provide (constructor parameters without defaults).
+    """
+
+    parameters = list(inspect.signature(cls).parameters.values())
+
+    return any(p.default is p.empty and p.kind in (p.POSITIONAL_ONLY,
+                                                   p.POSITIONAL_OR_KEYWORD,
+                                                   p.KEYWORD_ONLY)
+               for p in parameters)
+
+def main(argv=None):
+    """
+    Command line interface for soak.
+    """
+
+    wheels = [name for name, obj in inspect.getmembers(_colorwheel,inspect.isclass)
+              if issubclass(obj,_colorwheel.base.ColorWheel)
+              and obj is not _colorwheel.base.ColorWheel
+              and not _needs_arguments(obj)]
+
+    parser = argparse.ArgumentParser(prog="python3 -m colorchron.soak",
+                                     description="Run a clock through simulated time.")
+    parser.add_argument("--colorwheel",default="RGB",choices=wheels)
+    parser.add_argument("--seconds-per-cycle",type=float,default=86400)
+    parser.add_argument("--zero-position",type=float,default=240)
+    parser.add_argument("--counterclockwise",action="store_true")
+    parser.add_argument("--days",type=float,default=1.0)
+    parser.add_argument("--update-interval",type=float,default=0.1)
+    parser.add_argument("--event-driven",action="store_true")
+    parser.add_argument("--max-jump",type=int,default=16)
+    parser.add_argument("--no-allocations",action="store_true",
+                        help="do not track memory allocations")
+    args = parser.parse_args(argv)
+
+    wheel = getattr(_colorwheel,args.colorwheel)(seconds_per_cycle=args.seconds_per_cycle,
+                                                 zero_position=args.zero_position,
+                                                 counterclockwise=args.counterclockwise)
+
+    report = soak(wheel,
+                  days=args.days,
+                  max_jump=args.max_jump,
+                  track_allocations=not args.no_allocations,
+                  update_interval=args.update_interval,
+                  event_driven=args.event_driven)
+
+    json.dump(report,sys.stdout,indent=2)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+__description__ = \
+"""
+Layouts that give each led in a strip its own view of the colorwheel.  A
+layout assigns every led a time offset (seconds added to the current time)
+and a brightness weight.  The clock evaluates the wheel for the whole strip
+in one batch each update.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import numpy as np
+
+class Layout:
+    """
+    Base class for layouts.  Subclasses set self._offsets and self._weights
+    (num_leds arrays) in _configure.  A Layout can also be used directly with
+    explicit offsets and weights.
+    """
+
+    def __init__(self,num_leds,offsets=None,weights=None):
+        """
+        num_leds: number of leds in the strip.
+        offsets: time offset (seconds) for each led.  If None, all zero.
+        weights: brightness (0 to 1) of each led.  If None, all one.
+        """
+
+        self._num_leds = int(num_leds)
+        if self._num_leds <= 0:
+            err = "number of leds must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._offsets = np.zeros(self._num_leds,dtype=float)
+        self._weights = np.ones(self._num_leds,dtype=float)
+
+        self._configure()
+
+        if offsets is not None:
+            self._offsets = self._check(offsets,"offsets")
+        if weights is not None:
+            self._weights = self._check(weights,"weights")
+            if np.any(self._weights < 0) or np.any(self._weights > 1):
+                err = "weights must be between 0 and 1.\n"
+                raise ValueError(err)
+
+    def _check(self,values,name):
+        """
+        Make sure values is a num_leds array.
+        """
+
+        values = np.array(values,dtype=float).reshape(-1)
+        if len(values) != self._num_leds:
+            err = "{} must have one entry per led.\n".format(name)
+            raise ValueError(err)
+
+        return values
+
+    def _configure(self):
+        """
+        Calculate offsets and weights (dummy method).
+        """
+
+        pass
+
+    @property
+    def num_leds(self):
+        return self._num_leds
+
+    @property
+    def offsets(self):
+        """
+        Time offset (seconds) for each led.
+        """
+
+        return self._offsets
+
+    @property
+    def weights(self):
+        """
+        Brightness (0 to 1) of each led.
+        """
+
+        return self._weights
+
+class Span(Layout):
+    """
+    Spread a stretch of time across the strip.  The first led shows the time
+    start seconds from now and the last shows start + span seconds from now,
+    so a strip can show, for example, the next six hours.
+    """
+
+    def __init__(self,num_leds,span=6*3600,start=0.0):
+        """
+        num_leds: number of leds in the strip.
+        span: seconds between the first and last led.
+        start: offset (seconds) of the first led from the current time.
+        """
+
+        self._span = span
+        self._start = start
+
+        super().__init__(num_leds)
+
+    def _configure(self):
+
+        if self._num_leds == 1:
+            self._offsets = np.array([self._start],dtype=float)
+        else:
+            self._offsets = self._start + np.linspace(0,self._span,self._num_leds)
+
+class Comet(Layout):
+    """
+    A bright head showing the current time with a tail of leds showing
+    earlier times, fading away from the head.
+    """
+
+    def __init__(self,num_leds,tail=3600,head=0,falloff=2.0,reverse=False):
+        """
+        num_leds: number of leds in the strip.
+        tail: how far back in time (seconds) the end of the tail reaches.
+        head: index of the led showing the current time.
+        falloff: how quickly the tail fades.  Tail brightness goes as
+                 (1 - distance)**falloff, where distance runs from 0 at the
+                 head to 1 at the end of the tail.
+        reverse: run the tail towards lower led indexes (True or False).
+        """
+
+        self._tail = tail
+        self._head = int(head)
+        self._falloff = falloff
+        self._reverse = bool(reverse)
+
+        if self._falloff < 0:
+            err = "falloff must not be negative.\n"
+            raise ValueError(err)
+
+        super().__init__(num_leds)
+
+    def _configure(self):
+
+        if self._head < 0 or self._head >= self._num_leds:
+            err = "head must be the index of an led in the strip.\n"
+            raise ValueError(err)
+
+        # Distance (in leds) behind the head, wrapping around the strip
+        index = np.arange(self._num_leds)
+        if self._reverse:
+            behind = (self._head - index) % self._num_leds
+        else:
+            behind = (index - self._head) % self._num_leds
+
+        # Distance from 0 at the head to 1 at the end of the tail, which
+        # shows the time tail seconds ago
+        distance = behind/max(self._num_leds - 1,1)
+
+        self._offsets = -distance*self._tail
+        self._weights = (1 - distance)**self._falloff
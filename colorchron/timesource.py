@@ -0,0 +1,145 @@
+__description__ = \
+"""
+Time sources for the clock.  The clock asks its time source for the time of
+day, for a monotonic time used to schedule updates, and to sleep.  Custom
+time sources need the same three methods (seconds_since_midnight, monotonic
+and sleep), plus wall_seconds to run under AsyncClock without blocking the
+event loop.  SystemTime uses the real clock; VirtualTime lets the clock be
+run faster than real time (or as fast as possible) for testing.
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import time, datetime
+
+class SystemTime:
+    """
+    Real time from the system clock.
+    """
+
+    def seconds_since_midnight(self):
+        """
+        Current time in (fractional) seconds since midnight.
+        """
+
+        now = datetime.datetime.now()
+
+        return (now.hour*60 + now.minute)*60 + now.second + now.microsecond/1e6
+
+    def monotonic(self):
+        """
+        Time that never goes backwards, used to schedule updates.
+        """
+
+        return time.monotonic()
+
+    def sleep(self,seconds,event=None):
+        """
+        Sleep for seconds.  If event (a threading or multiprocessing Event) is
+        given, return early when it is set.
+        """
+
+        if seconds <= 0:
+            return
+
+        if event is None:
+            time.sleep(seconds)
+        else:
+            event.wait(seconds)
+
+    def wall_seconds(self,seconds):
+        """
+        Real seconds that sleeping for seconds takes.
+        """
+
+        return max(seconds,0)
+
+class VirtualTime:
+    """
+    Simulated time.  If speed is None, virtual time only moves when the clock
+    sleeps (or advance is called), and sleeping returns immediately.  This
+    runs the clock as fast as the computer allows.  If speed is a number,
+    virtual time runs that many times faster than real time; sleeping for a
+    virtual second takes 1/speed real seconds.
+    """
+
+    def __init__(self,start=0.0,speed=None):
+        """
+        start: virtual time at which to start, in seconds since midnight.
+        speed: number of virtual seconds per real second (or None).
+        """
+
+        self._start = float(start)
+
+        self._speed = speed
+        if self._speed is not None and self._speed <= 0:
+            err = "speed must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._elapsed = 0.0
+        self._real_start = time.monotonic()
+
+    def monotonic(self):
+        """
+        Virtual seconds elapsed since this time source was created.
+        """
+
+        if self._speed is None:
+            return self._elapsed
+
+        return (time.monotonic() - self._real_start)*self._speed
+
+    def seconds_since_midnight(self):
+        """
+        Virtual time in (fractional) seconds since midnight.
+        """
+
+        return (self._start + self.monotonic()) % 86400
+
+    def sleep(self,seconds,event=None):
+        """
+        Let seconds of virtual time pass.  If event is given and speed is not
+        None, return early when it is set.
+        """
+
+        if seconds <= 0:
+            return
+
+        if self._speed is None:
+            self._elapsed += seconds
+        elif event is None:
+            time.sleep(seconds/self._speed)
+        else:
+            event.wait(seconds/self._speed)
+
+    def wall_seconds(self,seconds):
+        """
+        Real seconds that sleeping for seconds takes: 0 if speed is None
+        (sleep returns immediately), otherwise seconds/speed.  Virtual time
+        passes on its own while waiting that long.
+        """
+
+        if self._speed is None or seconds <= 0:
+            return 0
+
+        return seconds/self._speed
+
+    def advance(self,seconds):
+        """
+        Move virtual time forward without sleeping (speed None only).
+        """
+
+        if self._speed is not None:
+            err = "advance can only be used when speed is None.\n"
+            raise ValueError(err)
+
+        self._elapsed += seconds
+
+    @property
+    def days(self):
+        """
+        Number of whole virtual days that have passed since midnight on the
+        starting day.
+        """
+
+        return int((self._start + self.monotonic())//86400)
@@ -0,0 +1,157 @@
+__description__ = \
+"""
+Cross-fade between outputs when the clock output jumps (for example after a
+big change in ambient brightness or when a new colorwheel is added).
+"""
+__author__ = "Michael J. Harms"
+__date__ = "2026-10-17"
+
+import math
+
+import numpy as np
+
+def _linear(t):
+    return t
+
+def _smoothstep(t):
+    return t*t*(3 - 2*t)
+
+def _ease_out(t):
+    return 1 - (1 - t)*(1 - t)
+
+_easings = {"linear":_linear,
+            "smoothstep":_smoothstep,
+            "ease_out":_ease_out}
+
+class Transition:
+    """
+    Fade from the output currently on the leds to a new output whenever the
+    output jumps by more than threshold between updates.  The fade weights are
+    calculated once, when the Transition is created; each update during a
+    fade is a table lookup and a blend.  While a fade is running the clock
+    updates every frame_interval seconds rather than every update_interval.
+    """
+
+    __slots__ = ("_duration",
+                 "_frame_interval",
+                 "_threshold",
+                 "_weights",
+                 "_start_time",
+                 "_start_values",
+                 "_target")
+
+    def __init__(self,
+                 duration=1.0,
+                 frame_interval=1/30,
+                 threshold=8,
+                 easing="smoothstep"):
+        """
+        duration: length of a fade in seconds.
+        frame_interval: seconds between updates while fading.
+        threshold: start a fade if any channel of the output changes by more
+                   than this between updates.
+        easing: shape of the fade: 'linear', 'smoothstep' or 'ease_out'.
+        """
+
+        self._duration = duration
+        if self._duration <= 0:
+            err = "duration must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._frame_interval = frame_interval
+        if self._frame_interval <= 0:
+            err = "frame interval must be greater than zero.\n"
+            raise ValueError(err)
+
+        self._threshold = threshold
+        if self._threshold < 0:
+            err = "threshold must not be negative.\n"
+            raise ValueError(err)
+
+        try:
+            easing = _easings[easing]
+        except KeyError:
+            err = "easing '{}' not recognized.  Should be one of:\n".format(easing)
+            err += "    {}\n".format(", ".join(_easings))
+            raise ValueError(err)
+
+        # Weight given to the new output at each frame of the fade
+        num_frames = max(1,int(math.ceil(self._duration/self._frame_interval)))
+        t = np.arange(1,num_frames + 1)/num_frames
+        self._weights = easing(t).tolist()
+
+        self._start_time = None
+        self._start_values = None
+        self._target = None
+
+    @property
+    def frame_interval(self):
+        return self._frame_interval
+
+    @property
+    def active(self):
+        """
+        Whether a fade is in progress.
+        """
+
+        return self._start_time is not None
+
+    def begin(self,start_values,now):
+        """
+        Start a fade from start_values at time now.
+        """
+
+        self._start_values = np.array(start_values,dtype=float)
+        self._start_time = now
+
+    def cancel(self):
+        """
+        Stop any fade in progress.
+        """
+
+        self._start_time = None
+        self._start_values = None
+
+    def step(self,current,target,now):
+        """
+        Work out what to send to the leds.
+
+        current: values currently on the leds (None if nothing written yet).
+        target: values the clock wants to show now.
+        now: current time in seconds (time source monotonic clock).
+
+        Returns target itself if no fade is running, otherwise the blend
+        between the start of the fade and target.
+        """
+
+        # Jumps in the target (relative to the previous target) start a fade
+        # from whatever is on the leds right now
+        previous = self._target
+        self._target = np.array(target)
+        if current is not None and previous is not None and \
+           np.shape(previous) == np.shape(target) and \
+           np.max(np.abs(self._target - previous)) > self._threshold:
+            self.begin(current,now)
+
+        if self._start_time is None:
+            return target
+
+        frame = int((now - self._start_time)/self._frame_interval)
+        if frame >= len(self._weights):
+            self.cancel()
+            return target
+
+        if np.shape(self._start_values) != np.shape(target):
+            self.cancel()
+            return target
+
+        w = self._weights[frame]
+        blended = self._start_values + w*(self._target - self._start_values)
+
+        if np.issubdtype(self._target.dtype,np.integer):
+            blended = np.round(blended).astype(int)
+
+        if np.ndim(blended) == 1:
+            return tuple(blended.tolist())
+
+        return blended
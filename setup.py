@@ -19,5 +19,6 @@ setup(name='colorchron',
       url='https://github.com/harmsm/colorchron',
       download_url='https://github.com/harmsm/colorchron/tarball/0.1',
       zip_safe=False,
-      install_requires=["rpi_ws281x","adafruit-circuitpython-neopixel"],
+      install_requires=["numpy","rpi_ws281x","adafruit-circuitpython-neopixel"],
+      entry_points={"console_scripts":["colorchron-render=colorchron.render:main"]},
       classifiers=['Programming Language :: Python'])